@@ -0,0 +1,261 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ADAPTIVE DIFFICULTY
+# ========================================
+"""
+Adaptive difficulty: Elo ratings for questions and players.
+
+Every question in the pool has a rating in a NumPy array aligned with the
+pool's slots, plus attempt/correct counters. Ratings are seeded from the
+answered_questions history: the success rate is shrunk towards the rating
+implied by the question's difficulty tier, so an unanswered question simply
+keeps its tier rating. Players get a rating the first time they are seen,
+replayed from their own answer history.
+
+Each recorded answer is an Elo match between player and question: the
+player's rating moves by K * (result - expected) and the question's by the
+opposite amount, with the question's K shrinking as it collects attempts.
+
+Selection targets the question rating at which the player is expected to
+succeed ADAPTIVE_TARGET_SUCCESS of the time. It scores the whole pool in one
+vectorized pass (distance to the target plus a little jitter), with answered
+and excluded slots masked out, so no database query is involved.
+
+The ratings live in memory per worker and are rebuilt from the history when
+the question pool reloads. Nothing is loaded (and NumPy is not imported)
+until the engine is first used for a pick, so with ADAPTIVE_DIFFICULTY off
+and no /adaptive calls answering costs nothing extra. Answers are applied
+only while the ratings and the player are loaded; anything else is picked
+up from the history when they are next loaded. At most POOL_MAX_USERS
+player ratings are kept (least recently used dropped first).
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import math
+import os
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import AnsweredQuestion
+from question_pool import POOL_MAX_USERS, question_pool
+
+# Use the engine for /by-room-chest and room deals instead of the room tiers
+ADAPTIVE_DIFFICULTY = os.getenv("ADAPTIVE_DIFFICULTY", "0") == "1"
+# Chance of a correct answer that picked questions should offer the player
+TARGET_SUCCESS = float(os.getenv("ADAPTIVE_TARGET_SUCCESS", "0.7"))
+
+BASE_RATING = 1200.0  # New players
+TIER_RATINGS = {
+    "easy": 1000.0,
+    "medium": 1150.0,
+    "hard": 1300.0,
+    "very_hard": 1450.0,
+    "expert": 1600.0,
+}
+PLAYER_K = 32.0
+QUESTION_K = 16.0
+QUESTION_K_HALF_LIFE = 20   # Attempts after which a question's K is halved
+PRIOR_ANSWERS = 10          # Weight of the tier rating when seeding from history
+CHEST_RATING_STEP = 100.0   # Chest 1 is this much easier than chest 2, chest 3 this much harder
+JITTER = 25.0               # Rating points of noise so equal scores do not always pick the same slot
+
+# (question id, answered correctly)
+Answer = Tuple[int, bool]
+
+
+def expected_score(player: float, question):
+    """Probability that a player beats (answers) a question (Elo logistic)"""
+    return 1.0 / (1.0 + 10.0 ** ((question - player) / 400.0))
+
+
+def rating_for_success(success, opponent: float = BASE_RATING):
+    """Question rating at which a player of the opponent rating succeeds this often"""
+    import numpy as np
+
+    return opponent - 400.0 * np.log10(success / (1.0 - success))
+
+
+# Question rating offset from the player's rating that yields TARGET_SUCCESS
+TARGET_OFFSET = -400.0 * math.log10(TARGET_SUCCESS / (1.0 - TARGET_SUCCESS))
+
+
+def chest_offset(chest: int) -> float:
+    """Rating shift keeping a room's later chests harder"""
+    return (min(max(chest, 1), 3) - 2) * CHEST_RATING_STEP
+
+
+class AdaptiveEngine:
+    """Question and player ratings with vectorized question selection"""
+
+    def __init__(self):
+        self.version = -1  # Pool version the question arrays are aligned with
+        # NumPy arrays aligned with the pool's slots, created on first load
+        self.question_ids = None  # slot -> question id
+        self.ratings = None
+        self.attempts = None
+        self.correct = None
+
+        self._players: "OrderedDict[int, float]" = OrderedDict()  # user id -> rating
+        self._rng = None
+
+        # Metrics
+        self.updates = 0
+        self.picks = 0
+
+    # ==================== LOADING ====================
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the question arrays match the current pool"""
+        return self.version == question_pool.version
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """(Re)build the question arrays when the pool has changed"""
+        await question_pool.refresh(db)
+        if self.loaded:
+            return
+        import numpy as np
+
+        version = question_pool.version
+        rows = (await db.execute(
+            select(
+                AnsweredQuestion.question_id,
+                func.count(AnsweredQuestion.id),
+                func.sum(case((AnsweredQuestion.answered_correctly, 1), else_=0)),
+            ).group_by(AnsweredQuestion.question_id)
+        )).all()
+        if version != question_pool.version:
+            return  # The pool reloaded meanwhile; the next call rebuilds
+
+        size = len(question_pool.ids)
+        prior = np.full(size, BASE_RATING)
+        for difficulty, slots in question_pool.by_difficulty.items():
+            prior[np.frombuffer(slots, dtype=np.intc)] = TIER_RATINGS.get(difficulty, BASE_RATING)
+
+        attempts = np.zeros(size, dtype=np.int64)
+        correct = np.zeros(size, dtype=np.int64)
+        for question_id, count, correct_count in rows:
+            slot = question_pool.slots.get(question_id)
+            if slot is not None:
+                attempts[slot] = count
+                correct[slot] = correct_count or 0
+
+        # Success rate shrunk towards the tier's expected rate, then inverted
+        prior_success = expected_score(BASE_RATING, prior)
+        success = (correct + PRIOR_ANSWERS * prior_success) / (attempts + PRIOR_ANSWERS)
+        success = np.clip(success, 0.01, 0.99)
+
+        self.question_ids = np.frombuffer(question_pool.ids, dtype=np.intc).astype(np.int64)
+        self.ratings = rating_for_success(success)
+        self.attempts = attempts
+        self.correct = correct
+        if self._rng is None:
+            self._rng = np.random.default_rng()
+        self.version = version
+
+    async def _player_rating(self, db: AsyncSession, user_id: int) -> float:
+        """A player's rating, replaying their history on first sight"""
+        rating = self._players.get(user_id)
+        if rating is not None:
+            self._players.move_to_end(user_id)
+            return rating
+
+        history = (await db.execute(
+            select(AnsweredQuestion.question_id, AnsweredQuestion.answered_correctly)
+            .where(AnsweredQuestion.user_id == user_id)
+            .order_by(AnsweredQuestion.answered_at, AnsweredQuestion.id)
+        )).all()
+        rating = BASE_RATING
+        for question_id, answered_correctly in history:
+            slot = question_pool.slots.get(question_id)
+            if slot is None or slot >= len(self.ratings):
+                continue
+            rating += PLAYER_K * (answered_correctly - float(expected_score(rating, self.ratings[slot])))
+
+        # Keep a rating seeded by a concurrent request meanwhile
+        rating = self._players.setdefault(user_id, rating)
+        self._players.move_to_end(user_id)
+        while len(self._players) > POOL_MAX_USERS:
+            self._players.popitem(last=False)
+        return rating
+
+    # ==================== UPDATES ====================
+
+    def record(self, user_id: int, answers: Iterable[Answer]):
+        """
+        Apply committed answers: one Elo match per answer, batched. Only
+        touches memory; skipped unless the ratings and the player are loaded
+        (a later load replays these answers from the history).
+        """
+        player = self._players.get(user_id)
+        if player is None or not self.loaded:
+            return
+        import numpy as np
+
+        answers = list(answers)
+        slots = [question_pool.slots.get(question_id) for question_id, _ in answers]
+        results = [float(correct) for (_, correct), slot in zip(answers, slots) if slot is not None]
+        slots = np.array([slot for slot in slots if slot is not None], dtype=np.int64)
+        if not len(slots):
+            return
+
+        results = np.array(results)
+        surprise = results - expected_score(player, self.ratings[slots])
+
+        question_k = QUESTION_K * 0.5 ** (self.attempts[slots] / QUESTION_K_HALF_LIFE)
+        np.subtract.at(self.ratings, slots, question_k * surprise)
+        np.add.at(self.attempts, slots, 1)
+        np.add.at(self.correct, slots, results.astype(np.int64))
+        self._players[user_id] = player + PLAYER_K * float(surprise.sum())
+        self.updates += len(slots)
+
+    # ==================== SELECTION ====================
+
+    async def pick(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        exclude_ids: Iterable[int] = (),
+        offset: float = 0.0
+    ) -> Optional[int]:
+        """Unanswered question whose rating best matches the player's target
+        (shifted by offset rating points)"""
+        await self.ensure_loaded(db)
+        if not self.loaded or not len(self.ratings):
+            return None
+        player = await self._player_rating(db, user_id)
+        bits = await question_pool.answered_slots(db, user_id)
+        if not self.loaded:
+            return None  # The pool reloaded meanwhile
+        import numpy as np
+
+        size = len(self.ratings)
+        answered = np.unpackbits(np.frombuffer(bytes(bits), dtype=np.uint8), bitorder="little")[:size]
+        distance = np.abs(self.ratings - (player + TARGET_OFFSET + offset))
+        distance += self._rng.random(size) * JITTER
+        distance[answered.astype(bool)] = np.inf
+        excluded = [question_pool.slots[qid] for qid in exclude_ids if qid in question_pool.slots]
+        if excluded:
+            distance[excluded] = np.inf
+
+        slot = int(np.argmin(distance))
+        if math.isinf(distance[slot]):
+            return None
+        self.picks += 1
+        return int(self.question_ids[slot])
+
+    def stats(self) -> dict:
+        loaded = self.ratings is not None and len(self.ratings) > 0
+        return {
+            "enabled": ADAPTIVE_DIFFICULTY,
+            "questions": len(self.ratings) if self.ratings is not None else 0,
+            "players": len(self._players),
+            "mean_question_rating": round(float(self.ratings.mean()), 1) if loaded else None,
+            "updates": self.updates,
+            "picks": self.picks,
+        }
+
+
+# Shared engine for the application
+adaptive = AdaptiveEngine()
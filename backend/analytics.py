@@ -0,0 +1,356 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ANSWER ANALYTICS
+# ========================================
+"""
+Incrementally maintained answer rollups.
+
+answer_rollups holds attempt and correct counts per (dimension, bucket, day)
+for the dimensions question, topic, difficulty, room and total. The analytics
+endpoints read only this table, never the raw answered_questions log.
+
+- Every recorded answer adds one attempt to each of its buckets. The counts
+  are kept in memory and upserted as increments every ANALYTICS_FLUSH_SECONDS,
+  so answering costs no extra writes on the request path.
+- When the rollups are empty but answers exist (the first start after an
+  upgrade), a backfill aggregates the answer log with INSERT ... SELECT. The
+  log keeps only each user's latest answer per question, so older history
+  counts once per user and question.
+- Every ANALYTICS_COMPACT_SECONDS the daily rows older than
+  ANALYTICS_DAILY_DAYS are merged into one row per month, dated the first of
+  that month.
+
+The flush loop, the backfill and the compaction all run in a task started
+from the app lifespan. Answers still in memory are lost if the process dies
+before a flush, which is acceptable for analytics.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import String, case, cast, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import AsyncSessionLocal, upsert_insert
+from models import AnswerRollup, AnsweredQuestion, Question
+
+logger = logging.getLogger(__name__)
+
+# Flush interval in seconds; 0 disables the rollups (and the background task)
+ANALYTICS_FLUSH_SECONDS = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "10"))
+# How often (seconds) old daily rows are compacted into monthly ones
+ANALYTICS_COMPACT_SECONDS = float(os.getenv("ANALYTICS_COMPACT_SECONDS", "3600"))
+# Days of per-day detail kept before compaction
+ANALYTICS_DAILY_DAYS = int(os.getenv("ANALYTICS_DAILY_DAYS", "90"))
+
+# Rows per multi-row upsert (keeps SQLite under its bound-parameter limit)
+UPSERT_CHUNK = 500
+
+# (dimension, bucket, day); buffered and merged counts are [attempts, correct]
+RollupKey = Tuple[str, str, date]
+
+
+def _correct_sum(column):
+    return func.sum(case((column, 1), else_=0))
+
+
+class AnswerAnalytics:
+    """Buffers rollup increments and keeps the rollup table compact"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[RollupKey, List[int]] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._compacted_at = 0.0
+        self.version = 0  # Bumped whenever the table changes (HTTP cache key)
+
+        # Metrics
+        self.answers_recorded = 0
+        self.rows_flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.backfilled = 0
+        self.compacted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    # ==================== RECORDING ====================
+
+    def record(
+        self,
+        question_id: int,
+        topic: str,
+        difficulty: str,
+        room: Optional[int],
+        correct: bool
+    ):
+        """Count one committed answer in every bucket it belongs to"""
+        if not self.enabled:
+            return
+        day = datetime.utcnow().date()
+        buckets = [
+            ("question", str(question_id)),
+            ("topic", topic),
+            ("difficulty", difficulty),
+            ("total", ""),
+        ]
+        if room is not None:
+            buckets.append(("room", str(room)))
+        for dimension, bucket in buckets:
+            counts = self._pending.setdefault((dimension, bucket, day), [0, 0])
+            counts[0] += 1
+            counts[1] += correct
+        self.answers_recorded += 1
+
+    # ==================== WRITING ====================
+
+    async def _upsert(self, db: AsyncSession, increments: Dict[RollupKey, List[int]]):
+        """Add attempt/correct increments to their rows, creating missing ones"""
+        rows = [
+            {"dimension": dimension, "bucket": bucket, "day": day, "attempts": attempts, "correct": correct}
+            for (dimension, bucket, day), (attempts, correct) in increments.items()
+        ]
+        insert_ = upsert_insert(db)
+        if insert_ is not None:
+            for start in range(0, len(rows), UPSERT_CHUNK):
+                stmt = insert_(AnswerRollup).values(rows[start:start + UPSERT_CHUNK])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[AnswerRollup.dimension, AnswerRollup.bucket, AnswerRollup.day],
+                    set_={
+                        "attempts": AnswerRollup.attempts + stmt.excluded.attempts,
+                        "correct": AnswerRollup.correct + stmt.excluded.correct,
+                    }
+                )
+                await db.execute(stmt)
+            return
+
+        for row in rows:
+            existing = await db.scalar(select(AnswerRollup).where(
+                AnswerRollup.dimension == row["dimension"],
+                AnswerRollup.bucket == row["bucket"],
+                AnswerRollup.day == row["day"]
+            ))
+            if existing is None:
+                db.add(AnswerRollup(**row))
+            else:
+                existing.attempts += row["attempts"]
+                existing.correct += row["correct"]
+        await db.flush()
+
+    async def flush(self):
+        """Write the buffered increments in one transaction"""
+        async with self._lock:
+            if not self._pending:
+                return
+
+            pending, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self._upsert(db, pending)
+                    await db.commit()
+            except Exception:
+                # Merge back so the next flush retries them
+                for key, (attempts, correct) in pending.items():
+                    counts = self._pending.setdefault(key, [0, 0])
+                    counts[0] += attempts
+                    counts[1] += correct
+                self.flush_errors += 1
+                logger.exception("Failed to flush %d analytics rollups", len(pending))
+                return
+
+            self.flushes += 1
+            self.rows_flushed += len(pending)
+            self.version += 1
+
+    async def backfill(self) -> bool:
+        """Aggregate the answer log into empty rollups; True if it ran"""
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                if await db.scalar(select(AnswerRollup.id).limit(1)) is not None:
+                    return False
+                if await db.scalar(select(AnsweredQuestion.id).limit(1)) is None:
+                    return False
+
+                # Everything buffered so far is committed, so the log covers it
+                self._pending.clear()
+                day = func.date(func.coalesce(AnsweredQuestion.answered_at, func.current_timestamp()))
+                buckets = {
+                    "question": cast(AnsweredQuestion.question_id, String),
+                    "topic": Question.topic,
+                    "difficulty": Question.difficulty,
+                    "room": cast(AnsweredQuestion.room_number, String),
+                    "total": literal("", String),
+                }
+                for dimension, bucket in buckets.items():
+                    query = (
+                        select(
+                            literal(dimension, String),
+                            bucket,
+                            day,
+                            func.count(AnsweredQuestion.id),
+                            _correct_sum(AnsweredQuestion.answered_correctly),
+                        )
+                        .select_from(AnsweredQuestion)
+                        .join(Question, Question.id == AnsweredQuestion.question_id)
+                        .group_by(*([bucket] if dimension != "total" else []), day)
+                    )
+                    if dimension == "room":
+                        query = query.where(AnsweredQuestion.room_number.is_not(None))
+                    await db.execute(
+                        insert(AnswerRollup).from_select(
+                            ["dimension", "bucket", "day", "attempts", "correct"], query
+                        )
+                    )
+                await db.commit()
+
+        self.backfilled += 1
+        self.version += 1
+        return True
+
+    async def compact(self):
+        """Merge daily rows older than ANALYTICS_DAILY_DAYS into monthly rows"""
+        cutoff = datetime.utcnow().date() - timedelta(days=ANALYTICS_DAILY_DAYS)
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(
+                        AnswerRollup.id,
+                        AnswerRollup.dimension,
+                        AnswerRollup.bucket,
+                        AnswerRollup.day,
+                        AnswerRollup.attempts,
+                        AnswerRollup.correct,
+                    ).where(AnswerRollup.day < cutoff)
+                )).all()
+
+                merged: Dict[RollupKey, List[int]] = {}
+                ids = []
+                for row_id, dimension, bucket, day, attempts, correct in rows:
+                    if day.day == 1:
+                        continue  # Already a monthly row
+                    counts = merged.setdefault((dimension, bucket, day.replace(day=1)), [0, 0])
+                    counts[0] += attempts
+                    counts[1] += correct
+                    ids.append(row_id)
+                if not ids:
+                    return
+
+                for start in range(0, len(ids), UPSERT_CHUNK):
+                    await db.execute(delete(AnswerRollup).where(AnswerRollup.id.in_(ids[start:start + UPSERT_CHUNK])))
+                await self._upsert(db, merged)
+                await db.commit()
+
+        self.compacted += len(ids)
+        self.version += 1
+
+    # ==================== BACKGROUND TASK ====================
+
+    async def _run(self):
+        try:
+            await self.backfill()
+        except Exception:
+            logger.exception("Failed to backfill analytics rollups")
+
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+            if time.monotonic() - self._compacted_at >= ANALYTICS_COMPACT_SECONDS:
+                self._compacted_at = time.monotonic()
+                try:
+                    await self.compact()
+                except Exception:
+                    logger.exception("Failed to compact analytics rollups")
+
+    def start(self):
+        """Start the flush/compaction task (called from the app lifespan)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the task and write everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    # ==================== READING ====================
+
+    async def summary(
+        self,
+        db: AsyncSession,
+        dimension: str,
+        days: Optional[int] = None,
+        order: str = "failures",
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """Attempts, correct answers and success rate per bucket of a dimension"""
+        attempts = func.sum(AnswerRollup.attempts)
+        correct = func.sum(AnswerRollup.correct)
+        ordering = {
+            "failures": ((attempts - correct).desc(),),
+            "attempts": (attempts.desc(),),
+            "success_rate": ((correct * 1.0 / attempts).asc(), attempts.desc()),
+        }[order]
+
+        query = (
+            select(AnswerRollup.bucket, attempts, correct)
+            .where(AnswerRollup.dimension == dimension)
+            .group_by(AnswerRollup.bucket)
+            .order_by(*ordering, AnswerRollup.bucket)
+        )
+        if days is not None:
+            query = query.where(AnswerRollup.day >= datetime.utcnow().date() - timedelta(days=days - 1))
+        if limit is not None:
+            query = query.limit(limit)
+
+        return [rollup_entry(bucket, attempts, correct) for bucket, attempts, correct in await db.execute(query)]
+
+    async def daily(self, db: AsyncSession, days: int) -> List[dict]:
+        """Answer totals per day (monthly rows for compacted periods)"""
+        rows = await db.execute(
+            select(AnswerRollup.day, AnswerRollup.attempts, AnswerRollup.correct)
+            .where(
+                AnswerRollup.dimension == "total",
+                AnswerRollup.day >= datetime.utcnow().date() - timedelta(days=days - 1)
+            )
+            .order_by(AnswerRollup.day)
+        )
+        return [rollup_entry(day.isoformat(), attempts, correct) for day, attempts, correct in rows]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending_rows": len(self._pending),
+            "answers_recorded": self.answers_recorded,
+            "rows_flushed": self.rows_flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "backfills": self.backfilled,
+            "rows_compacted": self.compacted,
+        }
+
+
+def rollup_entry(key: str, attempts: int, correct: int) -> dict:
+    attempts = int(attempts or 0)
+    correct = int(correct or 0)
+    return {
+        "key": key,
+        "attempts": attempts,
+        "correct": correct,
+        "incorrect": attempts - correct,
+        "success_rate": round(correct / attempts, 4) if attempts else None,
+    }
+
+
+# Shared analytics for the application
+analytics = AnswerAnalytics(ANALYTICS_FLUSH_SECONDS)
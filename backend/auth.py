@@ -2,30 +2,49 @@
 # DATA SCIENCE DUNGEON - JWT AUTHENTICATION
 # ========================================
 
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import os
 
-from database import get_db
+from cache import TTLCache
+from database import get_db, read_session_factory
 from models import User
-from schemas import TokenData
+from token_verifier import TokenVerifier
 
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "data-science-dungeon-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Password hashing configuration
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" or "process"
+
+# Authenticated-user cache configuration
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# Verified-token cache: entries live until the token's own exp (capped here)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_MAX_SECONDS = float(os.getenv("TOKEN_CACHE_MAX_SECONDS", str(ACCESS_TOKEN_EXPIRE_MINUTES * 60)))
+
+# jose (which pulls in cryptography) and bcrypt are imported on first use to
+# keep them off the startup path; tokens are verified by token_verifier
+
 # HTTP Bearer token
 security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
+    import bcrypt
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
@@ -33,14 +52,107 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
+    import bcrypt
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with a different cost factor than configured"""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool so the event loop keeps serving"""
+
+    def __init__(self, workers: int, max_queue: int, use_processes: bool = False):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(workers)
+
+        # Metrics
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the worker pool"""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password on the worker pool"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE,
+    use_processes=PASSWORD_HASH_EXECUTOR == "process",
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -51,23 +163,70 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[TokenData]:
-    """Decode and validate JWT token"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            return None
-        user_id = int(user_id_str)
-        return TokenData(user_id=user_id)
-    except (JWTError, ValueError):
+class CurrentUser:
+    """Lightweight principal for the authenticated user (no session attached)"""
+
+    __slots__ = ("id", "username", "email", "created_at")
+
+    def __init__(self, id: int, username: str, email: str, created_at: Optional[datetime]):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(user.id, user.username, user.email, user.created_at)
+
+
+# Hot-path token checks (token -> user id until exp), and user id -> CurrentUser
+token_verifier = TokenVerifier(SECRET_KEY, TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_SECONDS)
+user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """Drop a cached principal after its profile or credentials change"""
+    user_cache.pop(user_id)
+
+
+def auth_cache_stats() -> dict:
+    return {"tokens": token_verifier.stats(), "users": user_cache.stats()}
+
+
+def _token_user_id(token: str) -> Optional[int]:
+    """Resolve a token to its user id, verifying only on cache misses"""
+    return token_verifier.user_id(token)
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> Optional[CurrentUser]:
+    """Get the principal for a user id, hitting the database only on misses"""
+    principal = user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = await db.get(User, user_id)
+    if user is None:
         return None
 
+    principal = CurrentUser.from_user(user)
+    user_cache.set(user_id, principal)
+    return principal
+
+
+async def get_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+):
+    """Dependency for read-only endpoints: uses the read replica, except
+    for users who wrote recently (read-your-writes)"""
+    user_id = _token_user_id(credentials.credentials) if credentials else None
+    async with read_session_factory(user_id)() as db:
+        yield db
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,13 +234,11 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = credentials.credentials
-    token_data = decode_token(token)
-    
-    if token_data is None:
+    user_id = _token_user_id(credentials.credentials)
+    if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await _load_user(db, user_id)
     if user is None:
         raise credentials_exception
     
@@ -90,15 +247,14 @@ async def get_current_user(
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_db)
+) -> Optional[CurrentUser]:
     """Get current user if authenticated, otherwise return None"""
     if credentials is None:
         return None
     
-    token_data = decode_token(credentials.credentials)
-    if token_data is None:
+    user_id = _token_user_id(credentials.credentials)
+    if user_id is None:
         return None
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    return user
+    return await _load_user(db, user_id)
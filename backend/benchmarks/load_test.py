@@ -0,0 +1,288 @@
+# ========================================
+# DATA SCIENCE DUNGEON - LOAD TEST
+# ========================================
+"""
+Self-contained load test for the API.
+
+Seeds a synthetic database (N users, M questions, K answer rows), then drives
+concurrent game sessions through an in-process ASGI client:
+register -> start game -> 10 rooms x 3 chests (deal room, fetch question,
+answer, open chest, save) -> leaderboard. Reports p50/p95/p99 latency and
+requests/sec per endpoint and can write the results as JSON to diff between
+commits.
+
+Requires httpx (pip install httpx). Run from backend/:
+
+    python benchmarks/load_test.py --users 1000 --questions 2000 --answers 20000 \\
+        --sessions 50 --concurrency 10 --output results.json
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DIFFICULTIES = ["easy", "medium", "hard", "very_hard", "expert"]
+TOPICS = ["Statistics", "Machine Learning", "Deep Learning", "Python", "SQL", "Probability"]
+ROOMS = 10
+CHESTS_PER_ROOM = 3
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the Data Science Dungeon API")
+    parser.add_argument("--users", type=int, default=500, help="Synthetic users to seed")
+    parser.add_argument("--questions", type=int, default=1000, help="Synthetic questions to seed")
+    parser.add_argument("--answers", type=int, default=10000, help="Synthetic answer rows to seed")
+    parser.add_argument("--sessions", type=int, default=20, help="Game sessions to play")
+    parser.add_argument("--concurrency", type=int, default=5, help="Sessions in flight at once")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4,
+                        help="bcrypt cost for registrations (low so hashing does not dominate)")
+    parser.add_argument("--database-url", help="Use this database instead of a temporary SQLite file")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args()
+
+
+# ==================== SEEDING ====================
+
+def seed_database(users: int, questions: int, answers: int):
+    """Bulk-insert synthetic users, progress rows, questions and answers"""
+    from sqlalchemy import insert
+
+    from auth import get_password_hash
+    from database import engine
+    from migrations import ensure_schema
+    from models import AnsweredQuestion, GameProgress, Question, User, question_content_hash
+
+    with engine.begin() as conn:
+        ensure_schema(conn)
+
+    password_hash = get_password_hash("password")
+    question_rows = []
+    for i in range(1, questions + 1):
+        row = {
+            "question_text": f"Synthetic question {i}?",
+            "option_a": f"A{i}",
+            "option_b": f"B{i}",
+            "option_c": f"C{i}",
+            "option_d": f"D{i}",
+            "correct_answer": random.choice("ABCD"),
+            "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)],
+            "topic": TOPICS[i % len(TOPICS)],
+            "explanation": f"Explanation {i}",
+        }
+        row["content_hash"] = question_content_hash(row)
+        question_rows.append(row)
+
+    answer_pairs = set()
+    max_answers = min(answers, users * questions)
+    while len(answer_pairs) < max_answers:
+        answer_pairs.add((random.randint(1, users), random.randint(1, questions)))
+
+    with engine.begin() as conn:
+        if users:
+            conn.execute(insert(User), [
+                {"username": f"seed{i}", "email": f"seed{i}@example.com", "password_hash": password_hash}
+                for i in range(1, users + 1)
+            ])
+            conn.execute(insert(GameProgress), [
+                {
+                    "user_id": i,
+                    "current_room": random.randint(1, ROOMS),
+                    "score": random.randint(0, 10000),
+                    "opened_chests": 0,
+                }
+                for i in range(1, users + 1)
+            ])
+        if question_rows:
+            conn.execute(insert(Question), question_rows)
+        if answer_pairs:
+            conn.execute(insert(AnsweredQuestion), [
+                {
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "answered_correctly": random.random() < 0.7,
+                    "room_number": random.randint(1, ROOMS),
+                }
+                for user_id, question_id in answer_pairs
+            ])
+
+
+# ==================== SESSIONS ====================
+
+class Recorder:
+    """Latency samples per endpoint"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+async def play_session(client, recorder: Recorder, number: int):
+    """One player's game from registration to the leaderboard"""
+    call = recorder.call
+    response = await call(client, "POST /users/register", "POST", "/api/users/register", json={
+        "username": f"bench{number}",
+        "email": f"bench{number}@example.com",
+        "password": "password",
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    await call(client, "POST /progress", "POST", "/api/progress", headers=headers, json={})
+    await call(client, "GET /progress", "GET", "/api/progress", headers=headers)
+
+    score = correct = incorrect = 0
+    for room in range(1, ROOMS + 1):
+        await call(client, "GET /questions/room/{room}", "GET", f"/api/questions/room/{room}", headers=headers)
+        for chest in range(1, CHESTS_PER_ROOM + 1):
+            response = await call(
+                client, "GET /questions/by-room-chest", "GET",
+                f"/api/questions/by-room-chest?room={room}&chest={chest}", headers=headers
+            )
+            if response.status_code != 200:
+                continue
+            answered_correctly = random.random() < 0.7
+            await call(client, "POST /questions/answered", "POST", "/api/questions/answered", headers=headers, json={
+                "question_id": response.json()["id"],
+                "answered_correctly": answered_correctly,
+                "room_number": room,
+            })
+            if answered_correctly:
+                correct += 1
+                score += 100 * chest
+                await call(client, "POST /progress/chests", "POST", "/api/progress/chests",
+                           headers=headers, json={"room": room, "chest": chest})
+            else:
+                incorrect += 1
+            await call(client, "PUT /progress", "PUT", "/api/progress", headers=headers, json={
+                "current_room": room,
+                "score": score,
+                "total_correct": correct,
+                "total_incorrect": incorrect,
+            })
+
+    await call(client, "GET /questions/stats", "GET", "/api/questions/stats", headers=headers)
+    await call(client, "GET /leaderboard", "GET", "/api/leaderboard")
+    await call(client, "GET /leaderboard/me", "GET", "/api/leaderboard/me", headers=headers)
+
+
+async def run_sessions(sessions: int, concurrency: int) -> tuple:
+    import httpx
+
+    from main import app
+
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(number: int):
+        async with semaphore:
+            await play_session(client, recorder, number)
+
+    # ASGITransport does not run the lifespan, so enter it explicitly
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(number) for number in range(1, sessions + 1)))
+            elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+# ==================== REPORTING ====================
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, dict]:
+    endpoints = {}
+    for label, samples in sorted(recorder.samples.items()):
+        samples = sorted(samples)
+        endpoints[label] = {
+            "requests": len(samples),
+            "errors": recorder.errors.get(label, 0),
+            "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+        }
+    return endpoints
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(endpoints: Dict[str, dict], total: dict):
+    print(f"\n{'endpoint':<32} {'reqs':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, row in endpoints.items():
+        print(
+            f"{label:<32} {row['requests']:>6} {row['errors']:>4} {row['rps']:>8} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}"
+        )
+    print(f"\n{total['requests']} requests in {total['seconds']}s ({total['rps']} req/s)")
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+
+    # Configure the app before it is imported
+    workdir = tempfile.mkdtemp(prefix="dungeon-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("BCRYPT_ROUNDS", str(args.bcrypt_rounds))
+    sys.path.insert(0, BACKEND_DIR)
+
+    started = time.perf_counter()
+    seed_database(args.users, args.questions, args.answers)
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded {args.users} users, {args.questions} questions, {args.answers} answers in {seed_seconds:.1f}s")
+
+    recorder, elapsed = asyncio.run(run_sessions(args.sessions, args.concurrency))
+    endpoints = summarize(recorder, elapsed)
+    requests = sum(row["requests"] for row in endpoints.values())
+    total = {"requests": requests, "seconds": round(elapsed, 3), "rps": round(requests / elapsed, 1)}
+    print_report(endpoints, total)
+
+    if args.output:
+        results = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+            "total": total,
+            "endpoints": endpoints,
+        }
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# ========================================
+# DATA SCIENCE DUNGEON - SERIALIZATION BENCHMARK
+# ========================================
+"""
+Per-response CPU cost of the default FastAPI serialization path (ORM ->
+Pydantic validation -> jsonable_encoder -> json.dumps) versus the fast path
+in serializers.py (row tuples -> dicts -> orjson).
+
+Run from backend/: python benchmarks/serialization.py [--rows 130] [--number 2000]
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import AnsweredQuestion, Question
+from schemas import AnsweredQuestionResponse, QuestionResponse
+from serializers import ANSWERED_FIELDS, QUESTION_FIELDS, dumps, object_dict, row_dicts
+
+
+def answered_fixtures(count: int):
+    started = datetime(2024, 1, 1)
+    rows = [
+        (i, i, i % 3 != 0, started + timedelta(seconds=i), i % 10 + 1)
+        for i in range(1, count + 1)
+    ]
+    objects = [AnsweredQuestion(**dict(zip(ANSWERED_FIELDS, row))) for row in rows]
+    return rows, objects
+
+
+def question_fixture() -> Question:
+    return Question(
+        id=1,
+        question_text="What does the bias-variance tradeoff describe?" * 2,
+        option_a="Model complexity vs. error sources",
+        option_b="Training speed vs. memory",
+        option_c="Precision vs. recall",
+        option_d="Batch size vs. learning rate",
+        correct_answer="A",
+        difficulty="medium",
+        topic="Machine Learning",
+        explanation="Simple models underfit (bias); complex models overfit (variance).",
+    )
+
+
+def pydantic_path(adapter: TypeAdapter, value) -> bytes:
+    """What FastAPI does for a response_model endpoint"""
+    validated = adapter.validate_python(value, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def measure(label: str, func, number: int) -> float:
+    timer = timeit.Timer(func, timer=time.process_time)
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    print(f"  {label:<28} {best * 1e6:10.1f} us/response")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare response serialization paths")
+    parser.add_argument("--rows", type=int, default=130, help="Answered questions per list response")
+    parser.add_argument("--number", type=int, default=2000, help="Responses per timing run")
+    args = parser.parse_args()
+
+    rows, objects = answered_fixtures(args.rows)
+    question = question_fixture()
+    answered_adapter = TypeAdapter(List[AnsweredQuestionResponse])
+    question_adapter = TypeAdapter(QuestionResponse)
+
+    # Both paths must produce the same document
+    assert json.loads(pydantic_path(answered_adapter, objects)) == json.loads(dumps(row_dicts(ANSWERED_FIELDS, rows)))
+    assert json.loads(pydantic_path(question_adapter, question)) == json.loads(dumps(object_dict(QUESTION_FIELDS, question)))
+
+    print(f"GET /api/questions/answered ({args.rows} rows)")
+    slow = measure("pydantic + json", lambda: pydantic_path(answered_adapter, objects), args.number)
+    fast = measure("row tuples + fast json", lambda: dumps(row_dicts(ANSWERED_FIELDS, rows)), args.number)
+    print(f"  speedup: {slow / fast:.1f}x")
+
+    print("GET /api/questions/random (1 question)")
+    slow = measure("pydantic + json", lambda: pydantic_path(question_adapter, question), args.number * 20)
+    fast = measure("object dict + fast json", lambda: dumps(object_dict(QUESTION_FIELDS, question)), args.number * 20)
+    print(f"  speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
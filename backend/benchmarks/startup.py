@@ -0,0 +1,159 @@
+# ========================================
+# DATA SCIENCE DUNGEON - STARTUP REPORT
+# ========================================
+"""
+Cold-start report for the API.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and prints
+the slowest modules (cumulative and self time) plus the time grouped by
+top-level package, then times the app lifespan startup twice against the same
+database: the first boot runs the DDL, the restart finds the schema stamp
+and skips it. Can write the results as JSON to diff between commits.
+
+Run from backend/:
+
+    python benchmarks/startup.py --top 25 --output startup.json
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Times the lifespan startup (up to the point requests would be served)
+LIFESPAN_SNIPPET = """
+import asyncio, json, time
+started = time.perf_counter()
+from main import app
+imported = time.perf_counter()
+
+async def run():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return ready
+
+ready = asyncio.run(run())
+print(json.dumps({"import_ms": (imported - started) * 1000, "ready_ms": (ready - started) * 1000}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report import time and startup time of the API")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--database-url", help="Use this database instead of a temporary SQLite file")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args()
+
+
+def run_python(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+# ==================== IMPORT TIME ====================
+
+def import_times(env: Dict[str, str]) -> List[dict]:
+    """Parse the -X importtime output of importing main (times in ms)"""
+    result = run_python(["-X", "importtime", "-c", "import main"], env)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def by_package(modules: List[dict]) -> Dict[str, float]:
+    """Self time summed per top-level package"""
+    totals: Dict[str, float] = defaultdict(float)
+    for module in modules:
+        totals[module["module"].split(".")[0]] += module["self_ms"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+# ==================== LIFESPAN ====================
+
+def lifespan_times(env: Dict[str, str]) -> Dict[str, dict]:
+    """Startup twice: the first boot runs the DDL, the restart finds the schema stamp"""
+    return {
+        run: json.loads(run_python(["-c", LIFESPAN_SNIPPET], env).stdout.strip().splitlines()[-1])
+        for run in ("first_boot", "restart")
+    }
+
+
+# ==================== REPORTING ====================
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(modules: List[dict], packages: Dict[str, float], startup: Dict[str, dict], top: int):
+    main_module = next((module for module in modules if module["module"] == "main"), None)
+    if main_module:
+        print(f"import main: {main_module['cumulative_ms']:.1f} ms")
+
+    print(f"\n{'module (direct imports of main)':<40} {'cumulative ms':>14}")
+    for module in sorted((m for m in modules if m["depth"] == 1), key=lambda m: -m["cumulative_ms"])[:top]:
+        print(f"{module['module']:<40} {module['cumulative_ms']:>14.1f}")
+
+    print(f"\n{'module (slowest by self time)':<40} {'self ms':>14}")
+    for module in sorted(modules, key=lambda m: -m["self_ms"])[:top]:
+        print(f"{module['module']:<40} {module['self_ms']:>14.1f}")
+
+    print(f"\n{'package':<40} {'self ms':>14}")
+    for package, total in list(packages.items())[:top]:
+        print(f"{package:<40} {total:>14.1f}")
+
+    print(f"\n{'startup':<40} {'import ms':>10} {'lifespan ms':>12} {'ready ms':>10}")
+    for run, times in startup.items():
+        lifespan_ms = times["ready_ms"] - times["import_ms"]
+        print(f"{run:<40} {times['import_ms']:>10.1f} {lifespan_ms:>12.1f} {times['ready_ms']:>10.1f}")
+
+
+def main():
+    args = parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="dungeon-startup-")
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/startup.db"
+
+    modules = import_times(env)
+    packages = by_package(modules)
+    startup = lifespan_times(env)
+    print_report(modules, packages, startup, args.top)
+
+    if args.output:
+        results = {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "startup": startup,
+            "packages": packages,
+            "modules": sorted(modules, key=lambda m: -m["cumulative_ms"])[:args.top],
+        }
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
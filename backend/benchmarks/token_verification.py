@@ -0,0 +1,72 @@
+# ========================================
+# DATA SCIENCE DUNGEON - TOKEN VERIFICATION BENCHMARK
+# ========================================
+"""
+Verifications per second of the old token path (jose.jwt.decode + Pydantic
+TokenData) versus token_verifier: a cold verify (signature + claims) and a
+cached lookup for a recently seen token.
+
+Run from backend/: python benchmarks/token_verification.py [--tokens 1000] [--number 20000]
+"""
+
+from datetime import timedelta
+import argparse
+import os
+import sys
+import time
+import timeit
+
+from jose import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import ALGORITHM, SECRET_KEY, create_access_token
+from schemas import TokenData
+from token_verifier import TokenVerifier
+
+
+def jose_path(token: str) -> TokenData:
+    """The old token check: generic jose decode, then a Pydantic TokenData"""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return TokenData(user_id=int(payload["sub"]), exp=payload.get("exp"))
+
+
+def measure(label: str, func, tokens, number: int) -> float:
+    count = len(tokens)
+
+    def run():
+        for i in range(number):
+            func(tokens[i % count])
+
+    best = min(timeit.Timer(run, timer=time.process_time).repeat(repeat=5, number=1)) / number
+    print(f"  {label:<32} {1 / best:12,.0f} verifications/s {best * 1e6:8.2f} us")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JWT verification paths")
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens (users) in rotation")
+    parser.add_argument("--number", type=int, default=20000, help="Verifications per timing run")
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token({"sub": str(user_id)}, timedelta(hours=1))
+        for user_id in range(1, args.tokens + 1)
+    ]
+
+    # Both paths must agree on every token
+    verifier = TokenVerifier(SECRET_KEY, args.tokens, 3600)
+    for token in tokens:
+        assert verifier.verify(token)[0] == jose_path(token).user_id
+
+    print(f"{args.tokens} tokens, {args.number} verifications per run")
+    slow = measure("jose decode + TokenData", jose_path, tokens, args.number)
+    cold = measure("token_verifier.verify", verifier.verify, tokens, args.number)
+    for token in tokens:
+        verifier.user_id(token)
+    cached = measure("token_verifier.user_id (cached)", verifier.user_id, tokens, args.number)
+    print(f"  speedup: {slow / cold:.1f}x cold, {slow / cached:.1f}x cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# ========================================
+# DATA SCIENCE DUNGEON - CHEST STATE ENCODING
+# ========================================
+"""
+Opened chests stored as one integer bitmask.
+
+Chest n of room r is bit (r - 1) * CHESTS_PER_ROOM + (n - 1), so the whole
+dungeon (10 rooms x 3 chests) fits in 30 bits and opening a chest is a single
+OR. The client still sends and receives the original JSON list of
+{"room": r, "chest": n} objects; it is converted at the API boundary.
+"""
+
+from functools import lru_cache
+from typing import Any, List
+import json
+
+CHESTS_PER_ROOM = 3
+# BigInteger holds 63 usable bits
+MAX_ROOMS = 63 // CHESTS_PER_ROOM
+
+
+def chest_bit(room: int, chest: int) -> int:
+    """Bit for one chest; ValueError when the position is out of range"""
+    if not 1 <= room <= MAX_ROOMS or not 1 <= chest <= CHESTS_PER_ROOM:
+        raise ValueError(f"invalid chest position: room {room}, chest {chest}")
+    return 1 << ((room - 1) * CHESTS_PER_ROOM + chest - 1)
+
+
+def encode_chests(chests: Any) -> int:
+    """Bitmask for a client chest list; malformed entries are ignored"""
+    mask = 0
+    if not isinstance(chests, list):
+        return mask
+    for entry in chests:
+        try:
+            mask |= chest_bit(int(entry["room"]), int(entry["chest"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return mask
+
+
+def decode_chests(mask: int) -> List[dict]:
+    """Client chest list for a bitmask, ordered by room then chest"""
+    chests = []
+    bit = 0
+    mask = mask or 0
+    while mask >> bit:
+        if mask >> bit & 1:
+            room, chest = divmod(bit, CHESTS_PER_ROOM)
+            chests.append({"room": room + 1, "chest": chest + 1})
+        bit += 1
+    return chests
+
+
+@lru_cache(maxsize=4096)
+def chest_states_json(mask: int) -> str:
+    """The chest_states string returned to the client (JSON it parses itself)"""
+    return json.dumps(decode_chests(mask))
@@ -7,13 +7,15 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
 
-from database import SessionLocal, engine, Base
+from database import SessionLocal, engine
 from models import User, GameProgress
+from migrations import ensure_schema
+from chests import encode_chests
 from passlib.context import CryptContext
-import json
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+with engine.begin() as conn:
+    ensure_schema(conn)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -43,7 +45,7 @@ def create_test_user():
             for room in range(1, 11):
                 for chest in range(1, 4):
                     chests.append({"room": room, "chest": chest})
-            progress.chest_states = json.dumps(chests)
+            progress.opened_chests = encode_chests(chests)
             progress.game_completed = False
             
             db.commit()
@@ -73,7 +75,7 @@ def create_test_user():
                 score=5000,
                 total_correct=28,
                 total_incorrect=2,
-                chest_states=json.dumps(chests),
+                opened_chests=encode_chests(chests),
                 game_completed=False
             )
             db.add(progress)
@@ -2,31 +2,163 @@
 # DATA SCIENCE DUNGEON - DATABASE SETUP
 # ========================================
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from cache import TTLCache
+
 # Database URL - SQLite file in backend folder
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dungeon.db")
 
-# Create engine with SQLite-specific settings
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto the matching async driver"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:"):
+        return "postgresql+asyncpg:" + url[len("postgresql:"):]
+    if url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url[len("postgres:"):]
+    return url
+
+
+# Async URL used by the API (override to pick a specific driver)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Optional read replica for read-only endpoints
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+# Seconds a user's reads stay on the primary after they write
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "10"))
+
+# Connection pool tuning (per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# SQLite production profile, applied to every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB (64 MiB)
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite tuning pragmas on connect"""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def create_db_engine(url: str, is_async: bool = False):
+    """Create a sync or async engine with the tuning profile for its backend"""
+    database_url = make_url(url)
+    options = {}
+
+    if database_url.get_backend_name() == "sqlite":
+        file_db = database_url.database not in (None, "", ":memory:")
+        options["connect_args"] = {"check_same_thread": False}  # Shared across threads by the pool
+        if file_db:
+            # Reuse connections (aiosqlite defaults to opening one per session)
+            if is_async:
+                options["poolclass"] = AsyncAdaptedQueuePool
+            options["pool_size"] = DB_POOL_SIZE
+            options["max_overflow"] = DB_MAX_OVERFLOW
+            options["pool_timeout"] = DB_POOL_TIMEOUT
+    else:
+        options["pool_size"] = DB_POOL_SIZE
+        options["max_overflow"] = DB_MAX_OVERFLOW
+        options["pool_timeout"] = DB_POOL_TIMEOUT
+        options["pool_recycle"] = DB_POOL_RECYCLE
+        options["pool_pre_ping"] = DB_POOL_PRE_PING
+
+    if is_async:
+        db_engine = create_async_engine(url, **options)
+        sync_engine = db_engine.sync_engine
+    else:
+        db_engine = create_engine(url, **options)
+        sync_engine = db_engine
+
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+
+    return db_engine
+
+
+# Sync engine - used by scripts (seeding, test users)
+engine = create_db_engine(DATABASE_URL)
+
+# Async engine - used by the API so queries never block the event loop
+async_engine = create_db_engine(ASYNC_DATABASE_URL, is_async=True)
+
+# Read engine - the replica when configured, otherwise the primary
+read_engine = (
+    create_db_engine(to_async_url(DATABASE_READ_URL), is_async=True)
+    if DATABASE_READ_URL else async_engine
 )
 
-# Session factory
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Responses read attributes after commit
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Users who wrote recently read from the primary (read-your-writes)
+_recent_writers = TTLCache(100000, READ_STICKY_SECONDS)
 
 # Base class for models
 Base = declarative_base()
 
+# Dialects with INSERT ... ON CONFLICT DO UPDATE ... RETURNING support
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert_insert(db: AsyncSession):
+    """Get the dialect's upsert-capable insert() for a session, or None"""
+    dialect = db.get_bind().dialect
+    if not dialect.insert_returning:
+        return None
+    return UPSERT_INSERTS.get(dialect.name)
+
+
+def mark_write(user_id: int):
+    """Pin a user's reads to the primary for READ_STICKY_SECONDS"""
+    if read_engine is not async_engine:
+        _recent_writers.set(user_id, True)
+
+
+def read_session_factory(user_id=None):
+    """Session factory for a read: replica unless the user just wrote"""
+    if user_id is not None and _recent_writers.get(user_id):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,348 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION DECKS
+# ========================================
+"""
+Persisted per-user shuffled question decks.
+
+When a game starts, every difficulty gets a shuffled deck of the user's
+unanswered question ids, stored as a packed int array plus a position. Drawing
+is a cursor advance rather than a random pick, so each question comes up once
+before any repeats. Decks are rebuilt in the background (never on the request
+path) when the question bank changes or a deck runs out; until then draws
+fall back to the in-memory question pool.
+
+Decks are kept unpacked in memory per user (loaded in one query on first
+use, or straight from a build), so a draw touches no database. Advanced
+positions are written back in one batched UPDATE every DECK_FLUSH_SECONDS,
+like the progress buffer; a crash loses at most that much cursor movement,
+which only means a few questions are skipped over. With several worker
+processes a user should stick to one worker (as for progress saves).
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+import asyncio
+import logging
+import os
+import random
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import AsyncSessionLocal
+from models import Question, QuestionDeck, unanswered_by
+from question_pool import question_pool
+
+logger = logging.getLogger(__name__)
+
+# Position write-back interval in seconds; 0 writes every draw through
+DECK_FLUSH_SECONDS = float(os.getenv("DECK_FLUSH_SECONDS", "5"))
+# Users whose decks are kept in memory (users with unsaved positions stay)
+DECK_MAX_USERS = int(os.getenv("DECK_MAX_USERS", "10000"))
+
+# Core executemany UPDATE; decks replaced meanwhile are simply skipped
+FLUSH_STATEMENT = (
+    update(QuestionDeck.__table__)
+    .where(QuestionDeck.__table__.c.id == bindparam("b_id"))
+    .values(position=bindparam("b_position"))
+)
+
+
+def fingerprint_key(fingerprint: Optional[tuple]) -> str:
+    """Stored form of the question bank fingerprint (count, max id, revision sum)"""
+    count, max_id, revisions = fingerprint or (0, None, None)
+    return f"{count}:{max_id or 0}:{revisions or 0}"
+
+
+class Deck:
+    """One loaded deck: row id, question ids, cursor and bank fingerprint"""
+
+    __slots__ = ("id", "question_ids", "position", "fingerprint")
+
+    def __init__(self, deck_id: int, question_ids: array, position: int, fingerprint: str):
+        self.id = deck_id
+        self.question_ids = question_ids
+        self.position = position
+        self.fingerprint = fingerprint
+
+
+def _unpack(packed: bytes) -> array:
+    question_ids = array("i")
+    question_ids.frombytes(packed)
+    return question_ids
+
+
+class DeckStore:
+    """Builds decks off the request path and draws from them in memory"""
+
+    def __init__(self, interval: float, max_users: int):
+        self.interval = interval
+        self.max_users = max_users
+        # user_id -> {difficulty: Deck}
+        self._decks: "OrderedDict[int, Dict[str, Deck]]" = OrderedDict()
+        self._dirty: Dict[int, Deck] = {}  # deck id -> deck with an unsaved position
+        self._building: Dict[int, asyncio.Task] = {}
+        self._rebuild: set = set()  # Users to build again when their build ends
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.builds = 0
+        self.loads = 0
+        self.draws = 0
+        self.misses = 0
+        self.positions_flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether positions are written back in batches"""
+        return self.interval > 0
+
+    # ==================== BUILDING ====================
+
+    async def build(self, user_id: int):
+        """Shuffle fresh decks of the user's unanswered questions (own session)"""
+        async with AsyncSessionLocal() as db:
+            # One pass over the bank; the NOT EXISTS flag marks unanswered rows
+            rows = (await db.execute(
+                select(Question.id, Question.difficulty, Question.revision, unanswered_by(user_id))
+            )).all()
+
+            decks: Dict[str, array] = {}
+            revisions = 0
+            for question_id, difficulty, revision, unanswered in rows:
+                revisions += revision or 0
+                deck = decks.setdefault(difficulty, array("i"))
+                if unanswered:
+                    deck.append(question_id)
+
+            fingerprint = fingerprint_key((len(rows), max((row[0] for row in rows), default=0), revisions))
+            values = []
+            for difficulty, question_ids in decks.items():
+                random.shuffle(question_ids)
+                values.append({
+                    "user_id": user_id,
+                    "difficulty": difficulty,
+                    "question_ids": question_ids.tobytes(),
+                    "position": 0,
+                    "bank_fingerprint": fingerprint,
+                })
+
+            await db.execute(delete(QuestionDeck).where(QuestionDeck.user_id == user_id))
+            if values:
+                await db.execute(insert(QuestionDeck), values)
+            deck_ids = dict((await db.execute(
+                select(QuestionDeck.difficulty, QuestionDeck.id).where(QuestionDeck.user_id == user_id)
+            )).all())
+            await db.commit()
+        self.builds += 1
+
+        # The new decks replace whatever was loaded (and unsaved) before
+        self._forget(user_id)
+        self._remember(user_id, {
+            difficulty: Deck(deck_ids[difficulty], question_ids, 0, fingerprint)
+            for difficulty, question_ids in decks.items()
+            if difficulty in deck_ids
+        })
+
+        if fingerprint != fingerprint_key(question_pool.fingerprint):
+            # The bank changed since the pool last looked; reload it so the
+            # new decks are not considered stale
+            question_pool.invalidate()
+
+    async def _build_logged(self, user_id: int):
+        try:
+            await self.build(user_id)
+        except Exception:
+            logger.exception("Failed to build question decks for user %d", user_id)
+
+    def schedule_build(self, user_id: int, fresh: bool = False):
+        """
+        Rebuild a user's decks in the background (one build per user at a
+        time). With fresh=True (the user's answers were just reset) a build
+        already running is followed by another one.
+        """
+        if user_id in self._building:
+            if fresh:
+                self._rebuild.add(user_id)
+            return
+        task = asyncio.create_task(self._build_logged(user_id))
+        self._building[user_id] = task
+        task.add_done_callback(lambda _: self._build_done(user_id))
+
+    def _build_done(self, user_id: int):
+        self._building.pop(user_id, None)
+        if user_id in self._rebuild:
+            self._rebuild.discard(user_id)
+            self.schedule_build(user_id)
+
+    # ==================== MEMORY ====================
+
+    def _remember(self, user_id: int, decks: Dict[str, Deck]):
+        self._decks[user_id] = decks
+        self._decks.move_to_end(user_id)
+        # Only users without unsaved positions can be dropped
+        while len(self._decks) > self.max_users:
+            for cached_user, cached in self._decks.items():
+                if not any(deck.id in self._dirty for deck in cached.values()):
+                    del self._decks[cached_user]
+                    break
+            else:
+                return
+
+    def _forget(self, user_id: int):
+        for deck in (self._decks.pop(user_id, None) or {}).values():
+            self._dirty.pop(deck.id, None)
+
+    def forget_user(self, user_id: int):
+        """Drop a user's loaded decks and unsaved positions (e.g. after a reset)"""
+        self._forget(user_id)
+
+    async def _user_decks(self, db: AsyncSession, user_id: int) -> Dict[str, Deck]:
+        """The user's decks by difficulty, loaded in one query on first use"""
+        decks = self._decks.get(user_id)
+        if decks is not None:
+            self._decks.move_to_end(user_id)
+            return decks
+
+        rows = (await db.execute(
+            select(
+                QuestionDeck.id,
+                QuestionDeck.difficulty,
+                QuestionDeck.question_ids,
+                QuestionDeck.position,
+                QuestionDeck.bank_fingerprint,
+            ).where(QuestionDeck.user_id == user_id)
+        )).all()
+        if user_id in self._decks:
+            return self._decks[user_id]  # A build finished meanwhile
+
+        decks = {
+            difficulty: Deck(deck_id, _unpack(packed), position, fingerprint)
+            for deck_id, difficulty, packed, position, fingerprint in rows
+        }
+        self.loads += 1
+        self._remember(user_id, decks)
+        return decks
+
+    # ==================== DRAWING ====================
+
+    async def draw(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        difficulty: str,
+        exclude_ids: Iterable[int] = ()
+    ) -> Optional[int]:
+        """
+        Next unanswered question id from the user's deck, advancing its
+        position. Returns None (and schedules a rebuild where useful) when the
+        deck is missing, stale or used up; the caller then uses the pool.
+        """
+        await question_pool.refresh(db)
+        deck = (await self._user_decks(db, user_id)).get(difficulty)
+        if deck is None or deck.fingerprint != fingerprint_key(question_pool.fingerprint):
+            self.misses += 1
+            self.schedule_build(user_id)
+            return None
+
+        question_ids = deck.question_ids
+        excluded = set(exclude_ids)
+        position = deck.position
+
+        drawn = None
+        while position < len(question_ids):
+            question_id = question_ids[position]
+            position += 1
+            if question_id in excluded or question_id not in question_pool.slots:
+                continue
+            if await question_pool.is_answered(db, user_id, question_id):
+                continue
+            drawn = question_id
+            break
+
+        if position != deck.position:
+            deck.position = position
+            self._dirty[deck.id] = deck
+            if not self.enabled:
+                await self.flush()
+
+        if drawn is None:
+            self.misses += 1
+            # A deck that was empty when built stays empty until the bank changes
+            if question_ids:
+                self.schedule_build(user_id)
+            return None
+
+        self.draws += 1
+        return drawn
+
+    # ==================== FLUSHING ====================
+
+    async def flush(self):
+        """Write every unsaved deck position in one transaction"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            dirty, self._dirty = self._dirty, {}
+            rows = [{"b_id": deck_id, "b_position": deck.position} for deck_id, deck in dirty.items()]
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(FLUSH_STATEMENT, rows)
+                    await db.commit()
+            except Exception:
+                # Keep them (unless replaced meanwhile) so the next flush retries
+                for deck_id, deck in dirty.items():
+                    self._dirty.setdefault(deck_id, deck)
+                self.flush_errors += 1
+                logger.exception("Failed to flush %d deck positions", len(rows))
+                return
+
+            self.flushes += 1
+            self.positions_flushed += len(rows)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush task (called from the app lifespan)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Wait for builds still running and write the unsaved positions"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._building:
+            await asyncio.gather(*self._building.values(), return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "builds": self.builds,
+            "building": len(self._building),
+            "loaded_users": len(self._decks),
+            "loads": self.loads,
+            "draws": self.draws,
+            "misses": self.misses,
+            "dirty_decks": len(self._dirty),
+            "positions_flushed": self.positions_flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+        }
+
+
+# Shared deck store for the application
+decks = DeckStore(DECK_FLUSH_SECONDS, DECK_MAX_USERS)
@@ -0,0 +1,151 @@
+# ========================================
+# DATA SCIENCE DUNGEON - HTTP RESPONSE CACHE
+# ========================================
+"""
+Conditional GET support for read endpoints.
+
+Each cached endpoint describes its response with a key built from version
+counters (leaderboard version, question pool version, a per-user answers
+version...). The ETag is a hash of that key, so a matching If-None-Match is
+answered with 304 before any query or serialization runs. Otherwise the
+serialized body is served from an in-process cache, built at most once per
+version.
+
+ETags include a per-process boot id, so counters restarting at zero (or an
+ETag issued by another worker) can only cause a cache miss.
+
+The version counters themselves are per process, though: a worker that did
+not see a user's write keeps its old ETag (a stale 304 until its own counters
+move) and serves its cached body for up to HTTP_CACHE_TTL_SECONDS. With
+several worker processes a user's reads and writes should stick to one worker
+(as for progress saves).
+"""
+
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Awaitable, Callable, Hashable
+import hashlib
+import os
+import secrets
+
+from fastapi import Request, Response
+
+from cache import TTLCache
+from serializers import dumps
+
+# Serialized bodies kept server-side
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "10000"))
+HTTP_CACHE_TTL_SECONDS = float(os.getenv("HTTP_CACHE_TTL_SECONDS", "300"))
+# Browser max-age for public responses; 0 means "store but always revalidate"
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+# Per-user version counters kept before the least recently changed are dropped
+HTTP_CACHE_MAX_VERSIONS = int(os.getenv("HTTP_CACHE_MAX_VERSIONS", "100000"))
+
+BOOT_ID = secrets.token_hex(8)
+
+
+class VersionCounters:
+    """
+    Change counters per key (e.g. per user). Values come from one global
+    clock; a dropped key reports the clock value at the time it was dropped,
+    so it can never return a version that was issued for older data.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._clock = count(1)
+        self._last = 0
+        self._floor = 0
+        self._versions: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    def get(self, key: Hashable) -> int:
+        return self._versions.get(key, self._floor)
+
+    def bump(self, key: Hashable):
+        """Record that the data behind a key has changed"""
+        self._last = next(self._clock)
+        self._versions[key] = self._last
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.maxsize:
+            self._versions.popitem(last=False)
+            self._floor = self._last
+
+
+def make_etag(key: tuple) -> str:
+    digest = hashlib.blake2b(repr((BOOT_ID,) + key).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check an If-None-Match header (list, weak or '*') against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Versioned ETags plus a server-side cache of serialized JSON bodies"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._bodies = TTLCache(maxsize, ttl)
+        self.not_modified = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def respond(
+        self,
+        request: Request,
+        key: tuple,
+        build: Callable[[], Awaitable[Any]],
+        private: bool = False
+    ) -> Response:
+        """Answer with 304, a cached body, or a freshly built one"""
+        etag = make_etag(key)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control(private),
+            "Vary": "Authorization",
+        }
+
+        if etag_matches(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        body = self._bodies.get(key)
+        if body is None:
+            self.misses += 1
+            body = dumps(await build())
+            self._bodies.set(key, body)
+        else:
+            self.hits += 1
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        self._bodies.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._bodies),
+            "not_modified": self.not_modified,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def cache_control(private: bool) -> str:
+    if private:
+        return "private, no-cache"
+    if HTTP_CACHE_MAX_AGE > 0:
+        return f"public, max-age={HTTP_CACHE_MAX_AGE}"
+    return "public, no-cache"
+
+
+# Shared cache and counters for the application
+response_cache = ResponseCache(HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_TTL_SECONDS)
+answer_versions = VersionCounters(HTTP_CACHE_MAX_VERSIONS)
@@ -0,0 +1,162 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION IMPORTER
+# ========================================
+"""
+Bulk, streaming importer for question banks.
+
+Reads JSONL or CSV files row by row, validates each row against
+QuestionImport and upserts them in chunks keyed by content hash, so
+re-importing a file is a no-op and edited explanations/difficulties are
+updated in place. Memory use is bounded by the chunk size.
+
+Updated rows get their revision bumped, which changes the question pool
+fingerprint, so running servers reload the pool (and its cached stats) on
+their next check. The report counts only rows actually inserted or changed.
+
+Run: python import_questions.py questions.jsonl [more.csv ...] [--chunk-size 1000]
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Union
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import engine, UPSERT_INSERTS
+from migrations import ensure_schema
+from models import Question, question_content_hash
+from schemas import QuestionImport
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns refreshed when an existing question is re-imported
+UPDATE_COLUMNS = ("correct_answer", "difficulty", "topic", "explanation")
+
+
+class UnparsedRow(NamedTuple):
+    """A line that is not valid JSON (reported as an invalid row)"""
+    error: str
+
+
+def read_rows(path: str) -> Iterator[Union[dict, UnparsedRow]]:
+    """Stream raw rows from a .jsonl or .csv file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield UnparsedRow(f"invalid JSON: {e}")
+
+
+def validated(rows: Iterable[dict], report: Dict[str, int], source: str = "") -> Iterator[dict]:
+    """Validate rows and attach their content hash; invalid rows are reported and skipped"""
+    for line_number, row in enumerate(rows, start=1):
+        report["read"] += 1
+        if isinstance(row, UnparsedRow):
+            report["invalid"] += 1
+            print(f"  {source}:{line_number} skipped: {row.error}")
+            continue
+        try:
+            question = QuestionImport.model_validate(row).model_dump()
+        except ValidationError as e:
+            report["invalid"] += 1
+            print(f"  {source}:{line_number} skipped: {e.errors()[0]['msg']}")
+            continue
+        question["content_hash"] = question_content_hash(question)
+        yield question
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_chunk(conn, chunk: List[dict]) -> int:
+    """Upsert one chunk with a single executemany statement; returns the
+    number of rows inserted or changed"""
+    # Later rows win when a chunk repeats a question
+    chunk = list({row["content_hash"]: row for row in chunk}.values())
+    insert = UPSERT_INSERTS.get(conn.dialect.name)
+
+    if insert is not None and conn.dialect.insert_returning:
+        table = Question.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Question.content_hash],
+            set_={
+                **{column: stmt.excluded[column] for column in UPDATE_COLUMNS},
+                # No ORM events fire here; the revision tells the pool
+                "revision": func.coalesce(table.c.revision, 0) + 1,
+            },
+            # Identical rows are left alone (and not returned)
+            where=or_(*(table.c[column].is_distinct_from(stmt.excluded[column]) for column in UPDATE_COLUMNS))
+        )
+        return len(conn.execute(stmt.returning(table.c.id), chunk).all())
+
+    # Generic fallback: insert only the questions not already present
+    hashes = [row["content_hash"] for row in chunk]
+    existing = set(conn.scalars(select(Question.content_hash).where(Question.content_hash.in_(hashes))))
+    new_rows = [row for row in chunk if row["content_hash"] not in existing]
+    if new_rows:
+        conn.execute(Question.__table__.insert(), new_rows)
+    return len(new_rows)
+
+
+def import_questions(rows: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE, source: str = "") -> Dict[str, float]:
+    """Validate and upsert an iterable of question dicts; returns an import report"""
+    report = {"read": 0, "invalid": 0, "written": 0}
+    started = time.perf_counter()
+
+    for chunk in chunked(validated(rows, report, source), chunk_size):
+        # One transaction per chunk keeps locks short on big imports
+        with engine.begin() as conn:
+            report["written"] += _write_chunk(conn, chunk)
+
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+    report["rows_per_sec"] = round(report["read"] / elapsed) if elapsed > 0 else 0
+    return report
+
+
+def prepare_database():
+    """Make sure tables and the content_hash column/index exist"""
+    with engine.begin() as conn:
+        ensure_schema(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import questions from JSONL or CSV files")
+    parser.add_argument("files", nargs="+", help="Question files (.jsonl or .csv)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    prepare_database()
+    for path in args.files:
+        print(f"Importing {path}...")
+        report = import_questions(read_rows(path), args.chunk_size, source=path)
+        print(
+            f"  {report['written']} written, {report['invalid']} invalid "
+            f"in {report['seconds']}s ({report['rows_per_sec']} rows/sec)"
+        )
+
+
+if __name__ == "__main__":
+    main()
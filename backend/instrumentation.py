@@ -0,0 +1,246 @@
+# ========================================
+# DATA SCIENCE DUNGEON - INSTRUMENTATION
+# ========================================
+"""
+Opt-in request instrumentation (INSTRUMENTATION_ENABLED=1).
+
+- An ASGI middleware records a latency histogram and status counts per route.
+- SQLAlchemy cursor events count statements and database time per request
+  (tracked through a context variable) and flag likely N+1 patterns: the same
+  statement run N_PLUS_ONE_THRESHOLD or more times in one request.
+- A sample of requests (PROFILE_SAMPLE_RATE) is run under cProfile and dumped
+  to PROFILE_DIR as .prof files (open with `python -m pstats` or snakeviz).
+  cProfile is per thread, so a sampled profile also includes any other
+  requests that ran concurrently on the event loop.
+- GET /metrics serves everything in the Prometheus text format.
+
+When disabled nothing is installed: no middleware, no event listeners and no
+/metrics route.
+"""
+
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "0") == "1"
+# Fraction of requests to profile (0 disables profiling)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# Identical statements per request that count as an N+1 pattern
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+# Latency buckets in seconds (the Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    """Database work done while serving one request"""
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.total += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Metrics:
+    """In-process metric store rendered by /metrics"""
+
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.requests: Counter = Counter()      # (method, route, status)
+        self.db_queries: Counter = Counter()    # (method, route)
+        self.db_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.n_plus_one: Counter = Counter()    # (method, route)
+        self.profiles = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        self.latency[key].observe(seconds)
+        self.requests[(method, route, str(status))] += 1
+        self.db_queries[key] += stats.queries
+        self.db_seconds[key] += stats.db_seconds
+
+        if stats.statements:
+            statement, count = stats.statements.most_common(1)[0]
+            if count >= N_PLUS_ONE_THRESHOLD:
+                self.n_plus_one[key] += 1
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    method, route, count, statement[:200]
+                )
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        lines.append("# HELP dungeon_request_duration_seconds Request latency by route")
+        lines.append("# TYPE dungeon_request_duration_seconds histogram")
+        for (method, route), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'dungeon_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'dungeon_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.total}')
+            lines.append(f"dungeon_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"dungeon_request_duration_seconds_count{{{labels}}} {histogram.total}")
+
+        lines.append("# HELP dungeon_requests_total Requests by route and status")
+        lines.append("# TYPE dungeon_requests_total counter")
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'dungeon_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+            )
+
+        _render_counter(lines, "dungeon_db_queries_total", "SQL statements executed by route", self.db_queries)
+        _render_counter(lines, "dungeon_db_seconds_total", "Time spent in SQL statements by route", self.db_seconds)
+        _render_counter(lines, "dungeon_n_plus_one_total", "Requests with a repeated statement (likely N+1)", self.n_plus_one)
+
+        lines.append("# HELP dungeon_profiles_total Sampled request profiles written")
+        lines.append("# TYPE dungeon_profiles_total counter")
+        lines.append(f"dungeon_profiles_total {self.profiles}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _render_counter(lines: List[str], name: str, help_text: str, values: dict):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for (method, route), value in sorted(values.items()):
+        if isinstance(value, float):
+            value = f"{value:.6f}"
+        lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {value}')
+
+
+metrics = Metrics()
+
+
+# ==================== SQLALCHEMY HOOKS ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.db_seconds += time.perf_counter() - started.pop()
+    stats.queries += 1
+    stats.statements[statement] += 1
+
+
+def instrument_engine(sync_engine):
+    """Count statements run through an engine (pass AsyncEngine.sync_engine)"""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ==================== ASGI MIDDLEWARE ====================
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+class InstrumentationMiddleware:
+    """Times requests, collects their SQL stats and samples profiles"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        profiler = cProfile.Profile() if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE else None
+        started = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            metrics.record(method, route_path, status, elapsed, stats)
+            if profiler is not None:
+                _dump_profile(profiler, method, route_path)
+
+
+def _dump_profile(profiler: cProfile.Profile, method: str, route: str):
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        slug = _SLUG.sub("_", route).strip("_") or "root"
+        path = os.path.join(PROFILE_DIR, f"{int(time.time() * 1000)}-{method}-{slug}.prof")
+        profiler.dump_stats(path)
+        metrics.profiles += 1
+    except OSError:
+        logger.exception("Failed to write request profile")
+
+
+# ==================== SETUP ====================
+
+def install(app: FastAPI, *engines):
+    """Add the middleware, SQL hooks and /metrics route (no-op when disabled)"""
+    if not INSTRUMENTATION_ENABLED:
+        return
+
+    for engine in engines:
+        instrument_engine(getattr(engine, "sync_engine", engine))
+    app.add_middleware(InstrumentationMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Prometheus text exposition of the instrumentation metrics"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
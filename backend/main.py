@@ -5,19 +5,77 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 
-from database import engine, Base
-from routers import users, progress, questions, leaderboard
+from database import AsyncReadSessionLocal, async_engine, read_engine
+from migrations import ensure_schema
+from progress_buffer import progress_buffer
+from auth import auth_cache_stats, password_hasher
+from http_cache import response_cache
+from serializers import FAST_JSON
+from decks import decks
+from adaptive import adaptive
+from analytics import analytics
+from question_pool import question_pool
+import rankings
+from instrumentation import install as install_instrumentation
+from static_assets import STATIC_ASSETS_ENABLED, StaticAssetMiddleware, asset_store
+from routers import users, progress, questions, leaderboard, analytics as analytics_router
+
+logger = logging.getLogger(__name__)
+
+# Startup-performance mode: skip DDL when the schema stamp matches and warm
+# caches in the background instead of before accepting connections.
+# Set to 0 to always run the DDL and warm everything before serving.
+FAST_STARTUP = os.getenv("FAST_STARTUP", "1") != "0"
+
+
+async def warm_up():
+    """Load the question pool and the leaderboard rankings"""
+    async with AsyncReadSessionLocal() as db:
+        await question_pool.refresh(db)
+        await rankings.leaderboard.ensure_loaded()
+
+
+async def _warm_up_logged():
+    try:
+        await warm_up()
+    except Exception:
+        # Requests load whatever is missing on first use
+        logger.exception("Background warm-up failed")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - create tables on startup"""
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(ensure_schema, not FAST_STARTUP)
+    # Cheap (tens of ms) and index.html must never reference unhashed names
+    if STATIC_ASSETS_ENABLED:
+        asset_store.build(ROOT_DIR)
+    progress_buffer.start()
+    decks.start()
+    analytics.start()
+    if FAST_STARTUP:
+        # Runs once the server starts accepting connections
+        warm_up_task = asyncio.create_task(_warm_up_logged())
+    else:
+        await warm_up()
+        warm_up_task = None
     yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await progress_buffer.stop()
+    await analytics.stop()
+    await decks.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    if read_engine is not async_engine:
+        await read_engine.dispose()
 
 
 # Create FastAPI application
@@ -25,7 +83,9 @@ app = FastAPI(
     title="Data Science Dungeon API",
     description="Backend API for the Data Science Dungeon educational game",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every endpoint that still returns models/dicts
+    default_response_class=ORJSONResponse if FAST_JSON else JSONResponse
 )
 
 # Configure CORS for frontend communication
@@ -43,6 +103,10 @@ app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(progress.router, prefix="/api/progress", tags=["Game Progress"])
 app.include_router(questions.router, prefix="/api/questions", tags=["Questions"])
 app.include_router(leaderboard.router, prefix="/api/leaderboard", tags=["Leaderboard"])
+app.include_router(analytics_router.router, prefix="/api/analytics", tags=["Analytics"])
+
+# Latency/query metrics, sampled profiles and /metrics (INSTRUMENTATION_ENABLED=1)
+install_instrumentation(app, async_engine, read_engine)
 
 # Serve Static Files
 # Resolve paths relative to this file to work in both local and docker envs
@@ -50,6 +114,11 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Project root is one level up from backend/
 ROOT_DIR = os.path.dirname(BASE_DIR)
 
+# Fingerprinted, pre-compressed copies served from memory (built at startup);
+# the mounts and routes below remain the fallback
+if STATIC_ASSETS_ENABLED:
+    app.add_middleware(StaticAssetMiddleware, store=asset_store)
+
 # Mount directories
 app.mount("/js", StaticFiles(directory=os.path.join(ROOT_DIR, "js")), name="js")
 app.mount("/assets", StaticFiles(directory=os.path.join(ROOT_DIR, "assets")), name="assets")
@@ -68,6 +137,21 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/stats")
+async def health_stats():
+    """Internal performance counters"""
+    return {
+        "password_hasher": password_hasher.stats(),
+        "auth_cache": auth_cache_stats(),
+        "progress_buffer": progress_buffer.stats(),
+        "http_cache": response_cache.stats(),
+        "decks": decks.stats(),
+        "adaptive": adaptive.stats(),
+        "analytics": analytics.stats(),
+        "static_assets": asset_store.stats(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     # When running directly, we need to ensure we're finding the backend module
@@ -0,0 +1,203 @@
+# ========================================
+# DATA SCIENCE DUNGEON - SCHEMA MIGRATIONS
+# ========================================
+"""
+Lightweight migrations for databases created by older versions.
+
+create_all() only creates missing tables, so columns, indexes and constraints
+added to existing tables are applied here. Every step is idempotent and runs on startup.
+
+ensure_schema() wraps both behind a schema-version stamp: a hash of the
+declared tables, columns, indexes and constraints stored in schema_version.
+When the stored stamp matches the code, startup skips the DDL and all the
+inspector round trips; otherwise it runs them and writes the new stamp.
+"""
+
+from typing import Optional
+import hashlib
+import json
+import os
+
+from sqlalchemy import (
+    Column, String, Table, UniqueConstraint, bindparam, delete, insert, inspect, select, text, update
+)
+from sqlalchemy.engine import Connection
+
+from chests import encode_chests
+from database import Base
+from models import GameProgress, Question, question_content_hash
+
+# Set to 0 to run create_all() and the migrations on every startup
+SCHEMA_STAMP_ENABLED = os.getenv("SCHEMA_STAMP_ENABLED", "1") != "0"
+
+schema_version_table = Table(
+    "schema_version",
+    Base.metadata,
+    Column("version", String(40), primary_key=True),
+)
+
+
+def _existing_index_names(inspector, table_name: str) -> set:
+    names = {index["name"] for index in inspector.get_indexes(table_name)}
+    names |= {constraint["name"] for constraint in inspector.get_unique_constraints(table_name)}
+    return names
+
+
+def _dedupe_answered_questions(conn: Connection):
+    """Keep only the latest answer per user + question before adding the unique index"""
+    conn.execute(text(
+        "DELETE FROM answered_questions WHERE id NOT IN ("
+        "SELECT MAX(id) FROM answered_questions GROUP BY user_id, question_id)"
+    ))
+
+
+def _add_missing_columns(conn: Connection, inspector, table):
+    """Add (nullable) columns that were declared after the table was created"""
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+        added.append(column.name)
+    return added
+
+
+def _backfill_question_hashes(conn: Connection):
+    """Compute content hashes for questions stored before they existed"""
+    rows = conn.execute(
+        select(
+            Question.id,
+            Question.question_text,
+            Question.option_a,
+            Question.option_b,
+            Question.option_c,
+            Question.option_d,
+        ).where(Question.content_hash.is_(None))
+    ).mappings().all()
+    if not rows:
+        return
+
+    taken = set(conn.scalars(select(Question.content_hash).where(Question.content_hash.is_not(None))))
+    updates = []
+    for row in rows:
+        content_hash = question_content_hash(row)
+        if content_hash in taken:
+            continue  # Duplicate question - leave it unhashed
+        taken.add(content_hash)
+        updates.append({"b_id": row["id"], "b_hash": content_hash})
+
+    if updates:
+        conn.execute(
+            update(Question.__table__)
+            .where(Question.__table__.c.id == bindparam("b_id"))
+            .values(content_hash=bindparam("b_hash")),
+            updates
+        )
+
+
+def _backfill_opened_chests(conn: Connection, inspector):
+    """Convert the old JSON chest_states text into the opened_chests bitmask"""
+    columns = {column["name"] for column in inspector.get_columns("game_progress")}
+    if "chest_states" not in columns:
+        return
+
+    rows = conn.execute(text(
+        "SELECT id, chest_states FROM game_progress WHERE opened_chests IS NULL"
+    )).all()
+    updates = []
+    for progress_id, chest_states in rows:
+        try:
+            chests = json.loads(chest_states) if chest_states else []
+        except ValueError:
+            chests = []
+        updates.append({"b_id": progress_id, "b_mask": encode_chests(chests)})
+
+    if updates:
+        conn.execute(
+            update(GameProgress.__table__)
+            .where(GameProgress.__table__.c.id == bindparam("b_id"))
+            .values(opened_chests=bindparam("b_mask")),
+            updates
+        )
+
+
+def apply_migrations(conn: Connection):
+    """Add missing columns, indexes and unique constraints to existing tables"""
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        _add_missing_columns(conn, inspector, table)
+        existing = _existing_index_names(inspector, table.name)
+
+        # Unique constraints can't be added with ALTER on SQLite, so
+        # they are created as unique indexes with the same name
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint) or not constraint.name:
+                continue
+            if constraint.name in existing:
+                continue
+            if constraint.name == "uq_answered_user_question":
+                _dedupe_answered_questions(conn)
+            columns = ", ".join(column.name for column in constraint.columns)
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {constraint.name} ON {table.name} ({columns})"
+            ))
+
+        if table.name == "questions":
+            _backfill_question_hashes(conn)
+        elif table.name == "game_progress":
+            _backfill_opened_chests(conn, inspector)
+
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn, checkfirst=True)
+
+
+# ==================== SCHEMA STAMP ====================
+
+def schema_version() -> str:
+    """Hash of the declared schema (tables, columns, indexes, constraints)"""
+    digest = hashlib.sha1()
+    for table in Base.metadata.sorted_tables:
+        parts = [f"table:{table.name}"]
+        for column in table.columns:
+            parts.append(
+                f"column:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}:"
+                f"{','.join(sorted(fk.target_fullname for fk in column.foreign_keys))}"
+            )
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            parts.append(f"index:{index.name}:{index.unique}:{','.join(c.name for c in index.columns)}")
+        for constraint in sorted(
+            (c for c in table.constraints if isinstance(c, UniqueConstraint)),
+            key=lambda constraint: constraint.name or ""
+        ):
+            parts.append(f"unique:{constraint.name}:{','.join(c.name for c in constraint.columns)}")
+        digest.update("\n".join(parts).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _stored_schema_version(conn: Connection) -> Optional[str]:
+    if not inspect(conn).has_table(schema_version_table.name):
+        return None
+    return conn.scalar(select(schema_version_table.c.version))
+
+
+def ensure_schema(conn: Connection, force: bool = False) -> bool:
+    """
+    Create tables and apply migrations unless the stored stamp matches the
+    declared schema. Returns True when the DDL ran.
+    """
+    version = schema_version()
+    if not force and SCHEMA_STAMP_ENABLED and _stored_schema_version(conn) == version:
+        return False
+
+    Base.metadata.create_all(bind=conn)
+    apply_migrations(conn)
+    conn.execute(delete(schema_version_table))
+    conn.execute(insert(schema_version_table).values(version=version))
+    return True
@@ -2,9 +2,10 @@
 # DATA SCIENCE DUNGEON - DATABASE MODELS
 # ========================================
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Index, LargeBinary, UniqueConstraint, exists, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+import hashlib
 from database import Base
 
 
@@ -34,9 +35,9 @@ class GameProgress(Base):
     brightness_level = Column(Integer, default=100)
     total_correct = Column(Integer, default=0)
     total_incorrect = Column(Integer, default=0)
-    score = Column(Integer, default=0)
+    score = Column(Integer, default=0, index=True)
     game_completed = Column(Boolean, default=False)
-    chest_states = Column(Text, default="{}")  # JSON string for chest states
+    opened_chests = Column(BigInteger, default=0)  # Bitmask, see chests.py
     last_saved = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
@@ -57,6 +58,9 @@ class Question(Base):
     difficulty = Column(String(20), nullable=False, index=True)
     topic = Column(String(50), nullable=False, index=True)
     explanation = Column(Text, nullable=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=True)  # See question_content_hash
+    # Bumped by every UPDATE so in-place edits change the pool fingerprint
+    revision = Column(Integer, default=0, onupdate=literal_column("coalesce(revision, 0) + 1"))
 
     # Relationships
     answered_by = relationship("AnsweredQuestion", back_populates="question")
@@ -77,7 +81,59 @@ class AnsweredQuestion(Base):
     user = relationship("User", back_populates="answered_questions")
     question = relationship("Question", back_populates="answered_by")
 
-    # Ensure unique constraint on user_id + question_id
+    # One row per user + question; the second index covers per-user
+    # exclusion and correctness lookups without touching the table
     __table_args__ = (
-        # UniqueConstraint handled by index
+        UniqueConstraint("user_id", "question_id", name="uq_answered_user_question"),
+        Index("ix_answered_user_correct", "user_id", "answered_correctly", "question_id"),
+    )
+
+
+class QuestionDeck(Base):
+    """A user's shuffled order of unanswered questions for one difficulty"""
+    __tablename__ = "question_decks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    difficulty = Column(String(20), nullable=False)
+    question_ids = Column(LargeBinary, nullable=False)  # array("i") bytes, see decks.py
+    position = Column(Integer, default=0, nullable=False)  # Next index to draw
+    bank_fingerprint = Column(String(40), nullable=False)  # Question bank the deck was built from
+    built_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "difficulty", name="uq_deck_user_difficulty"),
+    )
+
+
+class AnswerRollup(Base):
+    """Answer counts per dimension value and day, maintained by analytics.py"""
+    __tablename__ = "answer_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dimension = Column(String(20), nullable=False)  # question, topic, difficulty, room or total
+    bucket = Column(String(100), nullable=False)    # Question id, topic, ... ("" for total)
+    day = Column(Date, nullable=False)              # First of the month once compacted
+    attempts = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("dimension", "bucket", "day", name="uq_rollup_dimension_bucket_day"),
+    )
+
+
+def question_content_hash(question: dict) -> str:
+    """Stable identity of a question: its text and options (used for idempotent imports)"""
+    parts = [
+        " ".join(str(question[field]).split())
+        for field in ("question_text", "option_a", "option_b", "option_c", "option_d")
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def unanswered_by(user_id: int):
+    """Anti-join filter: questions the user has not answered (NOT EXISTS)"""
+    return ~exists().where(
+        AnsweredQuestion.user_id == user_id,
+        AnsweredQuestion.question_id == Question.id
     )
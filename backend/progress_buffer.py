@@ -0,0 +1,199 @@
+# ========================================
+# DATA SCIENCE DUNGEON - PROGRESS WRITE-BEHIND BUFFER
+# ========================================
+"""
+Write-behind buffer for game progress autosaves.
+
+The client saves after every state change. Instead of committing each save,
+the latest state per user is kept in memory and flushed every
+PROGRESS_FLUSH_SECONDS in one batched transaction, so a burst of saves costs
+a single row write. Reads of a buffered user are served from memory.
+
+With several worker processes a user's reads and writes should stick to one
+worker (or set PROGRESS_FLUSH_SECONDS=0 to write through).
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+import asyncio
+import logging
+import os
+
+from sqlalchemy import bindparam, update
+
+from database import AsyncSessionLocal
+from models import GameProgress
+
+logger = logging.getLogger(__name__)
+
+# Flush interval in seconds; 0 disables buffering (every save writes through)
+PROGRESS_FLUSH_SECONDS = float(os.getenv("PROGRESS_FLUSH_SECONDS", "2"))
+# Clean snapshots kept for read-through before the oldest are evicted
+PROGRESS_BUFFER_MAX_USERS = int(os.getenv("PROGRESS_BUFFER_MAX_USERS", "10000"))
+
+PROGRESS_COLUMNS = (
+    "id",
+    "user_id",
+    "current_room",
+    "brightness_level",
+    "total_correct",
+    "total_incorrect",
+    "score",
+    "game_completed",
+    "opened_chests",
+    "last_saved",
+)
+
+
+# Columns rewritten by a flush
+FLUSH_COLUMNS = PROGRESS_COLUMNS[2:]
+
+# Core executemany UPDATE; rows deleted meanwhile are simply skipped
+FLUSH_STATEMENT = (
+    update(GameProgress.__table__)
+    .where(GameProgress.__table__.c.id == bindparam("b_id"))
+    .values({column: bindparam(f"b_{column}") for column in FLUSH_COLUMNS})
+)
+
+
+def progress_snapshot(progress: GameProgress) -> dict:
+    """Plain dict copy of a progress row"""
+    return {column: getattr(progress, column) for column in PROGRESS_COLUMNS}
+
+
+class ProgressBuffer:
+    """Latest progress state per user, flushed to the database in batches"""
+
+    def __init__(self, interval: float, max_users: int):
+        self.interval = interval
+        self.max_users = max_users
+        self._snapshots: "OrderedDict[int, dict]" = OrderedDict()
+        self._dirty: set = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.saves_buffered = 0
+        self.rows_flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    # ==================== READ / WRITE ====================
+
+    def get(self, user_id: int) -> Optional[dict]:
+        """Get the buffered state for a user, if any"""
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None:
+            self._snapshots.move_to_end(user_id)
+        return snapshot
+
+    def remember(self, progress: GameProgress) -> dict:
+        """Cache a row just read from or written to the database"""
+        snapshot = progress_snapshot(progress)
+        if self.enabled:
+            self._snapshots[progress.user_id] = snapshot
+            self._snapshots.move_to_end(progress.user_id)
+            self._evict()
+        return snapshot
+
+    def update(self, user_id: int, values: dict) -> Optional[dict]:
+        """
+        Merge a save into the buffered state. Returns the new state, or None
+        when the user has no snapshot yet (the caller writes through).
+        """
+        snapshot = self._snapshots.get(user_id) if self.enabled else None
+        if snapshot is None:
+            return None
+
+        snapshot.update(values)
+        snapshot["last_saved"] = datetime.utcnow()
+        self._snapshots.move_to_end(user_id)
+        self._dirty.add(user_id)
+        self.saves_buffered += 1
+        return snapshot
+
+    async def discard(self, user_id: int):
+        """Drop a user's buffered state before their row is replaced or deleted"""
+        async with self._flush_lock:
+            self._snapshots.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    def _evict(self):
+        # Only clean snapshots can be dropped; dirty ones wait for a flush
+        while len(self._snapshots) > self.max_users:
+            for user_id in self._snapshots:
+                if user_id not in self._dirty:
+                    del self._snapshots[user_id]
+                    break
+            else:
+                return
+
+    # ==================== FLUSHING ====================
+
+    async def flush(self):
+        """Write every dirty snapshot in one transaction"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            dirty, self._dirty = self._dirty, set()
+            rows = [
+                {f"b_{column}": value for column, value in self._snapshots[user_id].items()}
+                for user_id in dirty
+                if user_id in self._snapshots
+            ]
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(FLUSH_STATEMENT, rows)
+                    await db.commit()
+            except Exception:
+                # Keep the states so the next flush retries them
+                self._dirty |= dirty
+                self.flush_errors += 1
+                logger.exception("Failed to flush %d progress rows", len(rows))
+                return
+
+            self.flushes += 1
+            self.rows_flushed += len(rows)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush task (called from the app lifespan)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and drain everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "buffered_users": len(self._snapshots),
+            "dirty_users": len(self._dirty),
+            "saves_buffered": self.saves_buffered,
+            "rows_flushed": self.rows_flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+        }
+
+
+# Shared buffer for the application
+progress_buffer = ProgressBuffer(PROGRESS_FLUSH_SECONDS, PROGRESS_BUFFER_MAX_USERS)
@@ -0,0 +1,273 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION POOL
+# ========================================
+"""
+In-memory question pool used by the random question endpoints.
+
+The pool keeps only question ids, grouped by difficulty and topic as compact
+arrays of slot numbers. Each user gets a bitset of answered slots so a random
+unanswered question can be picked without touching the database.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import os
+import random
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache import TTLCache
+from models import Question, AnsweredQuestion
+
+# How often (seconds) the pool re-checks the questions table for changes
+POOL_CHECK_SECONDS = float(os.getenv("QUESTION_POOL_CHECK_SECONDS", "30"))
+# Maximum number of per-user answered bitsets kept in memory
+POOL_MAX_USERS = int(os.getenv("QUESTION_POOL_MAX_USERS", "10000"))
+# Random probes before falling back to a scan of the candidate slots
+SAMPLE_ATTEMPTS = 8
+# How long (seconds) a dealt room keeps its questions reserved
+ROOM_DEAL_TTL_SECONDS = float(os.getenv("ROOM_DEAL_TTL_SECONDS", "3600"))
+
+
+class QuestionPool:
+    """Question ids indexed by difficulty and topic, with per-user exclusions"""
+
+    def __init__(self):
+        self.ids = array("i")        # slot -> question id
+        self.slots: Dict[int, int] = {}  # question id -> slot
+        self.all_slots = array("i")
+        self.by_difficulty: Dict[str, array] = {}
+        self.by_topic: Dict[str, array] = {}
+        self.by_difficulty_topic: Dict[tuple, array] = {}
+        self.version = 0
+        self._bank_stats: Optional[tuple] = None  # (version, stats)
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._stale = True
+        # user_id -> (loaded_at, bitset of answered slots)
+        self._answered: "OrderedDict[int, tuple]" = OrderedDict()
+        # user_id -> {room: [question id per chest]}
+        self._deals = TTLCache(POOL_MAX_USERS, ROOM_DEAL_TTL_SECONDS)
+
+    # ==================== LOADING ====================
+
+    @property
+    def fingerprint(self) -> Optional[tuple]:
+        """(count, max id, revision sum) of the questions table when last checked"""
+        return self._fingerprint
+
+    def invalidate(self):
+        """Force a reload on the next access"""
+        self._stale = True
+
+    async def refresh(self, db: AsyncSession):
+        """Reload the pool if the questions table has changed"""
+        now = time.monotonic()
+        if not self._stale and now - self._checked_at < POOL_CHECK_SECONDS:
+            return
+
+        # Inserts and deletes move the count or max id; updates bump a revision
+        result = await db.execute(select(
+            func.count(Question.id),
+            func.max(Question.id),
+            func.sum(func.coalesce(Question.revision, 0)),
+        ))
+        fingerprint = tuple(result.one())
+        self._checked_at = now
+        if not self._stale and fingerprint == self._fingerprint:
+            return
+
+        result = await db.execute(
+            select(Question.id, Question.difficulty, Question.topic).order_by(Question.id)
+        )
+        self._load(result.all())
+        self._fingerprint = fingerprint
+        self._stale = False
+
+    def _load(self, rows):
+        ids = array("i")
+        slots = {}
+        by_difficulty: Dict[str, array] = {}
+        by_topic: Dict[str, array] = {}
+        by_difficulty_topic: Dict[tuple, array] = {}
+
+        for slot, (question_id, difficulty, topic) in enumerate(rows):
+            ids.append(question_id)
+            slots[question_id] = slot
+            by_difficulty.setdefault(difficulty, array("i")).append(slot)
+            by_topic.setdefault(topic, array("i")).append(slot)
+            by_difficulty_topic.setdefault((difficulty, topic), array("i")).append(slot)
+
+        self.ids = ids
+        self.slots = slots
+        self.all_slots = array("i", range(len(ids)))
+        self.by_difficulty = by_difficulty
+        self.by_topic = by_topic
+        self.by_difficulty_topic = by_difficulty_topic
+        self.version += 1
+        # Slot numbers changed, so every cached bitset is now meaningless
+        self._answered.clear()
+
+    async def bank_stats(self, db: AsyncSession) -> dict:
+        """Question counts by difficulty and topic, cached per pool version"""
+        await self.refresh(db)
+        if self._bank_stats is not None and self._bank_stats[0] == self.version:
+            return self._bank_stats[1]
+
+        version = self.version
+        rows = await db.execute(
+            select(Question.difficulty, Question.topic, func.count(Question.id))
+            .group_by(Question.difficulty, Question.topic)
+        )
+        stats = {"total_questions": 0, "by_difficulty": {}, "by_topic": {}}
+        for difficulty, topic, count in rows:
+            stats["total_questions"] += count
+            stats["by_difficulty"][difficulty] = stats["by_difficulty"].get(difficulty, 0) + count
+            stats["by_topic"][topic] = stats["by_topic"].get(topic, 0) + count
+
+        self._bank_stats = (version, stats)
+        return stats
+
+    # ==================== PER-USER EXCLUSIONS ====================
+
+    async def _user_bits(self, db: AsyncSession, user_id: int) -> bytearray:
+        """Get (loading if needed) the answered-slot bitset for a user"""
+        entry = self._answered.get(user_id)
+        if entry is not None and time.monotonic() - entry[0] < POOL_CHECK_SECONDS:
+            self._answered.move_to_end(user_id)
+            return entry[1]
+
+        while True:
+            # A refresh during the query can reload the pool; build against the
+            # slot layout captured here and only keep the bitset if it still holds
+            version, slots = self.version, self.slots
+            bits = bytearray((len(self.ids) + 7) // 8)
+            answered = await db.scalars(
+                select(AnsweredQuestion.question_id).where(AnsweredQuestion.user_id == user_id)
+            )
+            for question_id in answered:
+                slot = slots.get(question_id)
+                if slot is not None:
+                    bits[slot >> 3] |= 1 << (slot & 7)
+            if self.version == version:
+                break
+
+        self._answered[user_id] = (time.monotonic(), bits)
+        self._answered.move_to_end(user_id)
+        while len(self._answered) > POOL_MAX_USERS:
+            self._answered.popitem(last=False)
+        return bits
+
+    async def answered_slots(self, db: AsyncSession, user_id: int) -> bytearray:
+        """Bitset of the user's answered slots (bit slot & 7 of byte slot >> 3)"""
+        return await self._user_bits(db, user_id)
+
+    async def is_answered(self, db: AsyncSession, user_id: int, question_id: int) -> bool:
+        """Whether a user has answered a question (per the cached bitset)"""
+        bits = await self._user_bits(db, user_id)
+        slot = self.slots.get(question_id)
+        if slot is None:
+            return False
+        return bool(bits[slot >> 3] & (1 << (slot & 7)))
+
+    def mark_answered(self, user_id: int, question_id: int):
+        """Record an answer in the user's cached bitset (if loaded)"""
+        entry = self._answered.get(user_id)
+        slot = self.slots.get(question_id)
+        if entry is not None and slot is not None:
+            entry[1][slot >> 3] |= 1 << (slot & 7)
+
+    def forget_user(self, user_id: int):
+        """Drop a user's cached exclusions and deals (e.g. after a progress reset)"""
+        self._answered.pop(user_id, None)
+        self._deals.pop(user_id)
+
+    # ==================== SELECTION ====================
+
+    async def pick(
+        self,
+        db: AsyncSession,
+        difficulty: Optional[str] = None,
+        user_id: Optional[int] = None,
+        exclude_ids: Iterable[int] = (),
+        topic: Optional[str] = None,
+    ) -> Optional[int]:
+        """Pick a random question id, skipping answered and excluded questions"""
+        await self.refresh(db)
+        # Load the bitset first so the candidates below share its slot layout
+        bits = await self._user_bits(db, user_id) if user_id is not None else None
+
+        if difficulty is not None and topic is not None:
+            candidates = self.by_difficulty_topic.get((difficulty, topic))
+        elif difficulty is not None:
+            candidates = self.by_difficulty.get(difficulty)
+        elif topic is not None:
+            candidates = self.by_topic.get(topic)
+        else:
+            candidates = self.all_slots
+        if not candidates:
+            return None
+
+        excluded = {self.slots[qid] for qid in exclude_ids if qid in self.slots}
+
+        def available(slot: int) -> bool:
+            if bits is not None and bits[slot >> 3] & (1 << (slot & 7)):
+                return False
+            return slot not in excluded
+
+        # Rejection sampling: O(1) expected while most of the pool is unanswered
+        for _ in range(SAMPLE_ATTEMPTS):
+            slot = candidates[random.randrange(len(candidates))]
+            if available(slot):
+                return self.ids[slot]
+
+        # Nearly exhausted - scan the remaining candidates once
+        remaining = [slot for slot in candidates if available(slot)]
+        if not remaining:
+            return None
+        return self.ids[random.choice(remaining)]
+
+    # ==================== ROOM DEALS ====================
+
+    def reserve(self, user_id: int, room: int, question_ids: List[int]):
+        """Remember a room's dealt questions so per-chest lookups return them"""
+        rooms = self._deals.get(user_id) or {}
+        rooms[room] = question_ids
+        self._deals.set(user_id, rooms)
+
+    def reserved_elsewhere(self, user_id: int, room: int) -> List[int]:
+        """Question ids reserved for the user's other rooms"""
+        rooms = self._deals.get(user_id) or {}
+        return [
+            question_id
+            for other_room, question_ids in rooms.items() if other_room != room
+            for question_id in question_ids
+        ]
+
+    async def reserved(self, db: AsyncSession, user_id: int, room: int, chest: int) -> Optional[int]:
+        """The question dealt for a chest, unless it has been answered since"""
+        rooms = self._deals.get(user_id)
+        question_ids = rooms.get(room) if rooms else None
+        if not question_ids or not 1 <= chest <= len(question_ids):
+            return None
+
+        await self.refresh(db)
+        question_id = question_ids[chest - 1]
+        if question_id not in self.slots or await self.is_answered(db, user_id, question_id):
+            return None
+        return question_id
+
+
+# Shared pool for the application
+question_pool = QuestionPool()
+
+
+@event.listens_for(Question, "after_insert")
+@event.listens_for(Question, "after_update")
+@event.listens_for(Question, "after_delete")
+def _invalidate_pool(mapper, connection, target):
+    """Reload the pool after in-process question edits"""
+    question_pool.invalidate()
@@ -0,0 +1,128 @@
+# ========================================
+# DATA SCIENCE DUNGEON - LEADERBOARD RANKINGS
+# ========================================
+"""
+Materialized leaderboard kept in memory.
+
+Scores are stored in a list sorted by (-score, user_id), so rank lookups are
+a binary search and pages are plain slices. The progress routes update it as
+scores change instead of the leaderboard re-sorting game_progress per call.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import User, GameProgress
+from progress_buffer import progress_buffer
+
+# Full reload interval (seconds) to pick up writes from other workers; 0 disables
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "300"))
+
+# (username, score, current_room, game_completed)
+Entry = Tuple[str, int, int, bool]
+
+
+class Leaderboard:
+    """Sorted in-memory ranking of every player with game progress"""
+
+    def __init__(self):
+        self._keys: List[Tuple[int, int]] = []  # sorted (-score, user_id)
+        self._entries: Dict[int, Entry] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.version = 0
+
+    async def ensure_loaded(self):
+        """Load the rankings on first use (and periodically after that).
+        Reads the primary: a replica may not have the rows just flushed."""
+        if self._loaded_at is not None and (
+            LEADERBOARD_REFRESH_SECONDS <= 0
+            or time.monotonic() - self._loaded_at < LEADERBOARD_REFRESH_SECONDS
+        ):
+            return
+
+        loaded_at = self._loaded_at
+        async with self._lock:
+            if self._loaded_at != loaded_at:
+                return  # Another request reloaded while we waited
+            # Write buffered saves first so the snapshot includes them
+            await progress_buffer.flush()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(
+                        User.id,
+                        User.username,
+                        GameProgress.score,
+                        GameProgress.current_room,
+                        GameProgress.game_completed,
+                    ).join(GameProgress, User.id == GameProgress.user_id)
+                )
+                entries = {
+                    user_id: (username, score or 0, current_room or 1, bool(game_completed))
+                    for user_id, username, score, current_room, game_completed in result
+                }
+            self._entries = entries
+            self._keys = sorted((-entry[1], user_id) for user_id, entry in entries.items())
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def update(self, user_id: int, username: str, score: int, current_room: int, game_completed: bool):
+        """Insert or move a player after their progress changed"""
+        if not self.loaded:
+            return  # The first load will read it from the database
+
+        score = score or 0
+        old = self._entries.get(user_id)
+        if old is not None and old[1] != score:
+            self._remove_key(old[1], user_id)
+        if old is None or old[1] != score:
+            insort(self._keys, (-score, user_id))
+
+        self._entries[user_id] = (username, score, current_room or 1, bool(game_completed))
+        self.version += 1
+
+    def remove(self, user_id: int):
+        """Drop a player whose progress was deleted"""
+        old = self._entries.pop(user_id, None)
+        if old is not None:
+            self._remove_key(old[1], user_id)
+            self.version += 1
+
+    def _remove_key(self, score: int, user_id: int):
+        key = (-score, user_id)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def page(self, offset: int = 0, limit: int = 10) -> List[Tuple[int, Entry]]:
+        """Get (rank, entry) pairs for a slice of the rankings"""
+        keys = self._keys[offset:offset + limit]
+        return [
+            (rank, self._entries[user_id])
+            for rank, (_, user_id) in enumerate(keys, start=offset + 1)
+        ]
+
+    def rank_of(self, user_id: int) -> Optional[Tuple[int, Entry]]:
+        """Get a single player's (rank, entry)"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        rank = bisect_left(self._keys, (-entry[1], user_id)) + 1
+        return rank, entry
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# Shared leaderboard for the application
+leaderboard = Leaderboard()
@@ -0,0 +1,123 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ANALYTICS ROUTER
+# ========================================
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from pydantic import BaseModel
+
+from auth import get_read_db
+from analytics import analytics
+from http_cache import response_cache
+from models import Question
+
+
+router = APIRouter()
+
+ORDER_PATTERN = "^(failures|attempts|success_rate)$"
+
+
+class RollupEntry(BaseModel):
+    key: str
+    attempts: int
+    correct: int
+    incorrect: int
+    success_rate: Optional[float] = None
+
+
+class QuestionRollupEntry(RollupEntry):
+    question_id: int
+    question_text: Optional[str] = None
+    topic: Optional[str] = None
+    difficulty: Optional[str] = None
+
+
+async def _dimension(
+    request: Request,
+    db: AsyncSession,
+    dimension: str,
+    days: Optional[int],
+    order: str,
+    limit: Optional[int] = None
+):
+    """Cached summary of one rollup dimension"""
+    async def build():
+        return await analytics.summary(db, dimension, days, order, limit)
+
+    key = ("analytics", dimension, analytics.version, days, order, limit)
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/questions", response_model=List[QuestionRollupEntry])
+async def get_question_analytics(
+    request: Request,
+    days: Optional[int] = Query(None, ge=1, description="Only the last N days (all time if omitted)"),
+    order: str = Query("failures", pattern=ORDER_PATTERN, description="failures, attempts or success_rate"),
+    limit: int = Query(20, ge=1, le=100, description="Number of questions to return"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Questions answered wrong most often (or by attempts / lowest success rate)"""
+    async def build():
+        entries = await analytics.summary(db, "question", days, order, limit)
+        ids = [int(entry["key"]) for entry in entries]
+        rows = await db.execute(
+            select(Question.id, Question.question_text, Question.topic, Question.difficulty)
+            .where(Question.id.in_(ids))
+        )
+        questions = {row[0]: row for row in rows}
+        for entry, question_id in zip(entries, ids):
+            _, text, topic, difficulty = questions.get(question_id, (question_id, None, None, None))
+            entry.update(question_id=question_id, question_text=text, topic=topic, difficulty=difficulty)
+        return entries
+
+    key = ("analytics", "question", analytics.version, days, order, limit)
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/topics", response_model=List[RollupEntry])
+async def get_topic_analytics(
+    request: Request,
+    days: Optional[int] = Query(None, ge=1, description="Only the last N days (all time if omitted)"),
+    order: str = Query("failures", pattern=ORDER_PATTERN, description="failures, attempts or success_rate"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Answer counts and success rate per topic"""
+    return await _dimension(request, db, "topic", days, order)
+
+
+@router.get("/difficulties", response_model=List[RollupEntry])
+async def get_difficulty_analytics(
+    request: Request,
+    days: Optional[int] = Query(None, ge=1, description="Only the last N days (all time if omitted)"),
+    order: str = Query("failures", pattern=ORDER_PATTERN, description="failures, attempts or success_rate"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Answer counts and success rate per difficulty"""
+    return await _dimension(request, db, "difficulty", days, order)
+
+
+@router.get("/rooms", response_model=List[RollupEntry])
+async def get_room_analytics(
+    request: Request,
+    days: Optional[int] = Query(None, ge=1, description="Only the last N days (all time if omitted)"),
+    order: str = Query("failures", pattern=ORDER_PATTERN, description="failures, attempts or success_rate"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Answer counts and success rate per room"""
+    return await _dimension(request, db, "room", days, order)
+
+
+@router.get("/daily", response_model=List[RollupEntry])
+async def get_daily_analytics(
+    request: Request,
+    days: int = Query(30, ge=1, le=3660, description="Number of days to cover"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Answer totals per day (key is the date; compacted months appear as their 1st)"""
+    async def build():
+        return await analytics.daily(db, days)
+
+    key = ("analytics", "daily", analytics.version, days)
+    return await response_cache.respond(request, key, build)
@@ -2,14 +2,13 @@
 # DATA SCIENCE DUNGEON - LEADERBOARD ROUTER
 # ========================================
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from typing import List
 from pydantic import BaseModel
 
-from database import get_db
-from models import User, GameProgress
+from auth import CurrentUser, get_current_user
+from rankings import leaderboard
+from http_cache import response_cache
 
 
 router = APIRouter()
@@ -26,31 +25,53 @@ class LeaderboardEntry(BaseModel):
         from_attributes = True
 
 
+def _to_entry(rank: int, entry) -> dict:
+    """LeaderboardEntry fields as a plain dict (serialized without validation)"""
+    username, score, current_room, game_completed = entry
+    return {
+        "rank": rank,
+        "username": username,
+        "score": score,
+        "rooms_completed": current_room - 1 if not game_completed else 10,
+        "game_completed": game_completed,
+    }
+
+
 @router.get("", response_model=List[LeaderboardEntry])
-async def get_leaderboard(db: Session = Depends(get_db)):
+async def get_leaderboard(
+    request: Request,
+    offset: int = Query(0, ge=0, description="Number of ranks to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Number of ranks to return")
+):
     """
-    Get top 10 players sorted by highest score.
+    Get players sorted by highest score (top 10 by default).
     This endpoint is public - no authentication required.
     """
-    # Query users with their game progress, sorted by score
-    results = (
-        db.query(User, GameProgress)
-        .join(GameProgress, User.id == GameProgress.user_id)
-        .order_by(desc(GameProgress.score))
-        .limit(10)
-        .all()
-    )
-
-    leaderboard = []
-    for rank, (user, progress) in enumerate(results, start=1):
-        leaderboard.append(
-            LeaderboardEntry(
-                rank=rank,
-                username=user.username,
-                score=progress.score,
-                rooms_completed=progress.current_room - 1 if not progress.game_completed else 10,
-                game_completed=progress.game_completed
-            )
+    await leaderboard.ensure_loaded()
+
+    async def build():
+        return [_to_entry(rank, entry) for rank, entry in leaderboard.page(offset, limit)]
+
+    key = ("leaderboard", leaderboard.version, offset, limit)
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/me", response_model=LeaderboardEntry)
+async def get_my_rank(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Get the current user's rank"""
+    await leaderboard.ensure_loaded()
+    ranked = leaderboard.rank_of(current_user.id)
+    if ranked is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No game progress found"
         )
 
-    return leaderboard
+    async def build():
+        return _to_entry(*ranked)
+
+    key = ("leaderboard_me", current_user.id, leaderboard.version)
+    return await response_cache.respond(request, key, build, private=True)
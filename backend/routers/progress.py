@@ -3,121 +3,202 @@
 # ========================================
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-import json
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
-from models import User, GameProgress, AnsweredQuestion
-from schemas import GameProgressCreate, GameProgressUpdate, GameProgressResponse
-from auth import get_current_user
+from database import get_db, mark_write, upsert_insert
+from models import GameProgress, AnsweredQuestion, QuestionDeck
+from schemas import GameProgressCreate, GameProgressUpdate, GameProgressResponse, ChestOpen
+from auth import CurrentUser, get_current_user
+from question_pool import question_pool
+from rankings import leaderboard
+from progress_buffer import progress_buffer
+from http_cache import answer_versions
+from serializers import json_response, progress_dict
+from chests import chest_bit, encode_chests
+from decks import decks
 
 router = APIRouter()
 
 
+def _update_rank(current_user: CurrentUser, progress: dict):
+    """Keep the materialized leaderboard in step with a saved score"""
+    leaderboard.update(
+        current_user.id,
+        current_user.username,
+        progress["score"],
+        progress["current_room"],
+        progress["game_completed"]
+    )
+
+
+async def _upsert_progress(db: AsyncSession, user_id: int, values: dict) -> GameProgress:
+    """
+    Insert or update a user's progress, writing only the given columns.
+    Uses a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING where the
+    dialect supports it. The caller commits.
+    """
+    insert = upsert_insert(db)
+    if insert is not None:
+        stmt = insert(GameProgress).values(user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GameProgress.user_id],
+            set_={**values, "last_saved": func.now()}
+        ).returning(GameProgress)
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        return result.one()
+
+    # Fallback: read-modify-write
+    progress = await db.scalar(select(GameProgress).where(GameProgress.user_id == user_id))
+    if not progress:
+        progress = GameProgress(user_id=user_id)
+        db.add(progress)
+    for column, value in values.items():
+        setattr(progress, column, value)
+    await db.flush()
+    await db.refresh(progress)
+    return progress
+
+
 @router.get("", response_model=GameProgressResponse)
 async def get_progress(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user's game progress"""
-    progress = db.query(GameProgress).filter(GameProgress.user_id == current_user.id).first()
-    
+    buffered = progress_buffer.get(current_user.id)
+    if buffered is not None:
+        return json_response(progress_dict(buffered))
+
+    progress = await db.scalar(select(GameProgress).where(GameProgress.user_id == current_user.id))
+
     if not progress:
         # Create new progress if doesn't exist
-        progress = GameProgress(user_id=current_user.id)
-        db.add(progress)
-        db.commit()
-        db.refresh(progress)
-    
-    return progress
+        progress = await _upsert_progress(db, current_user.id, {})
+        await db.commit()
+        mark_write(current_user.id)
+        snapshot = progress_buffer.remember(progress)
+        _update_rank(current_user, snapshot)
+        return json_response(progress_dict(snapshot))
+
+    return json_response(progress_dict(progress_buffer.remember(progress)))
 
 
 @router.post("", response_model=GameProgressResponse)
 async def create_progress(
     progress_data: GameProgressCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create or reset game progress (start new game)"""
-    # Delete existing progress
-    existing = db.query(GameProgress).filter(GameProgress.user_id == current_user.id).first()
-    if existing:
-        db.delete(existing)
-        db.commit()
-    
+    await progress_buffer.discard(current_user.id)
+
     # Clear answered questions for new game
-    db.query(AnsweredQuestion).filter(AnsweredQuestion.user_id == current_user.id).delete()
-    db.commit()
-    
-    # Create new progress
-    chest_states_json = json.dumps(progress_data.chest_states) if progress_data.chest_states else "{}"
-    
-    new_progress = GameProgress(
-        user_id=current_user.id,
-        current_room=progress_data.current_room,
-        brightness_level=progress_data.brightness_level,
-        total_correct=progress_data.total_correct,
-        total_incorrect=progress_data.total_incorrect,
-        score=progress_data.score,
-        game_completed=progress_data.game_completed,
-        chest_states=chest_states_json
-    )
-    db.add(new_progress)
-    db.commit()
-    db.refresh(new_progress)
-    
-    return new_progress
+    await db.execute(delete(AnsweredQuestion).where(AnsweredQuestion.user_id == current_user.id))
+
+    # Overwrite every column so the saved game starts fresh
+    values = progress_data.model_dump(exclude={"chest_states"})
+    values["opened_chests"] = encode_chests(progress_data.chest_states)
+
+    new_progress = await _upsert_progress(db, current_user.id, values)
+    await db.commit()
+    mark_write(current_user.id)
+    answer_versions.bump(current_user.id)
+    question_pool.forget_user(current_user.id)
+    snapshot = progress_buffer.remember(new_progress)
+    _update_rank(current_user, snapshot)
+
+    # Shuffle the new game's question decks in the background
+    decks.forget_user(current_user.id)
+    decks.schedule_build(current_user.id, fresh=True)
+
+    return json_response(progress_dict(snapshot))
 
 
 @router.put("", response_model=GameProgressResponse)
 async def update_progress(
     progress_data: GameProgressUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update game progress"""
-    progress = db.query(GameProgress).filter(GameProgress.user_id == current_user.id).first()
-    
-    # Create if not exists (Upsert)
-    if not progress:
-        progress = GameProgress(user_id=current_user.id)
-        db.add(progress)
-    
-    # Update fields if provided
-    if progress_data.current_room is not None:
-        progress.current_room = progress_data.current_room
-    if progress_data.brightness_level is not None:
-        progress.brightness_level = progress_data.brightness_level
-    if progress_data.total_correct is not None:
-        progress.total_correct = progress_data.total_correct
-    if progress_data.total_incorrect is not None:
-        progress.total_incorrect = progress_data.total_incorrect
-    if progress_data.score is not None:
-        progress.score = progress_data.score
-    if progress_data.game_completed is not None:
-        progress.game_completed = progress_data.game_completed
+    """Update game progress (buffered, or an upsert of the provided fields)"""
+    values = progress_data.model_dump(exclude_none=True, exclude={"chest_states"})
     if progress_data.chest_states is not None:
-        progress.chest_states = json.dumps(progress_data.chest_states)
-    
-    db.commit()
-    db.refresh(progress)
-    
-    return progress
+        values["opened_chests"] = encode_chests(progress_data.chest_states)
+
+    # Coalesce into the write-behind buffer when the user's row is cached
+    buffered = progress_buffer.update(current_user.id, values)
+    if buffered is not None:
+        _update_rank(current_user, buffered)
+        return json_response(progress_dict(buffered))
+
+    progress = await _upsert_progress(db, current_user.id, values)
+    await db.commit()
+    mark_write(current_user.id)
+    snapshot = progress_buffer.remember(progress)
+    _update_rank(current_user, snapshot)
+
+    return json_response(progress_dict(snapshot))
+
+
+@router.post("/chests", response_model=GameProgressResponse)
+async def open_chest(
+    chest: ChestOpen,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark a single chest as opened (a delta instead of re-sending every chest)"""
+    try:
+        bit = chest_bit(chest.room, chest.chest)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    buffered = progress_buffer.get(current_user.id)
+    if buffered is not None:
+        opened = buffered["opened_chests"] or 0
+        if not opened & bit:
+            buffered = progress_buffer.update(current_user.id, {"opened_chests": opened | bit})
+        return json_response(progress_dict(buffered))
+
+    await db.execute(
+        update(GameProgress)
+        .where(GameProgress.user_id == current_user.id)
+        .values(opened_chests=func.coalesce(GameProgress.opened_chests, 0).op("|")(bit))
+    )
+    progress = await db.scalar(
+        select(GameProgress).where(GameProgress.user_id == current_user.id),
+        execution_options={"populate_existing": True}
+    )
+    if progress is None:
+        progress = await _upsert_progress(db, current_user.id, {"opened_chests": bit})
+    await db.commit()
+    mark_write(current_user.id)
+    snapshot = progress_buffer.remember(progress)
+    _update_rank(current_user, snapshot)
+
+    return json_response(progress_dict(snapshot))
 
 
 @router.delete("")
 async def delete_progress(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete game progress (reset game)"""
-    progress = db.query(GameProgress).filter(GameProgress.user_id == current_user.id).first()
-    
-    if progress:
-        db.delete(progress)
-    
-    # Clear answered questions
-    db.query(AnsweredQuestion).filter(AnsweredQuestion.user_id == current_user.id).delete()
-    db.commit()
-    
+    await progress_buffer.discard(current_user.id)
+    await db.execute(delete(GameProgress).where(GameProgress.user_id == current_user.id))
+
+    # Clear answered questions and question decks
+    await db.execute(delete(AnsweredQuestion).where(AnsweredQuestion.user_id == current_user.id))
+    await db.execute(delete(QuestionDeck).where(QuestionDeck.user_id == current_user.id))
+    await db.commit()
+    mark_write(current_user.id)
+    answer_versions.bump(current_user.id)
+    question_pool.forget_user(current_user.id)
+    decks.forget_user(current_user.id)
+    leaderboard.remove(current_user.id)
+
     return {"message": "Progress reset successfully"}
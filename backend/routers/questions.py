@@ -2,132 +2,214 @@
 # DATA SCIENCE DUNGEON - QUESTION ROUTES
 # ========================================
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-import random
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional
 
-from database import get_db
-from models import User, Question, AnsweredQuestion
-from schemas import QuestionResponse, AnswerQuestion, AnsweredQuestionResponse
-from auth import get_current_user, get_current_user_optional
+from database import get_db, mark_write, upsert_insert
+from models import Question, AnsweredQuestion
+from schemas import QuestionResponse, AnswerQuestion, AnswerBatch, AnsweredQuestionResponse
+from auth import CurrentUser, get_current_user, get_current_user_optional, get_read_db
+from question_pool import question_pool
+from decks import decks
+from adaptive import ADAPTIVE_DIFFICULTY, adaptive, chest_offset
+from analytics import analytics
+from http_cache import answer_versions, response_cache
+from serializers import ANSWERED_FIELDS, QUESTION_FIELDS, json_response, object_dict, row_dicts
 
 router = APIRouter()
 
+DIFFICULTIES = ["easy", "medium", "hard", "very_hard", "expert"]
+
+
+def _room_difficulties(room: int) -> List[str]:
+    """Difficulty of chests 1-3 in a room"""
+    if room <= 3:
+        return ["easy", "medium", "hard"]
+    elif room <= 6:
+        return ["medium", "hard", "very_hard"]
+    return ["hard", "very_hard", "expert"]
+
+
+async def _pick_question_id(
+    db: AsyncSession,
+    difficulty: Optional[str],
+    user_id: Optional[int],
+    exclude_ids: Iterable[int] = (),
+    topic: Optional[str] = None,
+    chest: Optional[int] = None
+) -> Optional[int]:
+    """
+    For room chests with adaptive difficulty on, pick by rating; otherwise
+    draw from the user's shuffled deck when one applies, else pick from the pool
+    """
+    if ADAPTIVE_DIFFICULTY and user_id is not None and chest is not None:
+        question_id = await adaptive.pick(db, user_id, exclude_ids, chest_offset(chest))
+        if question_id is not None:
+            return question_id
+    if user_id is not None and difficulty is not None and topic is None:
+        question_id = await decks.draw(db, user_id, difficulty, exclude_ids)
+        if question_id is not None:
+            return question_id
+    return await question_pool.pick(db, difficulty, user_id, exclude_ids, topic)
+
+
+async def _load_picked_question(
+    db: AsyncSession,
+    difficulty: Optional[str],
+    user_id: Optional[int],
+    exclude_ids: Optional[List[int]] = None,
+    topic: Optional[str] = None,
+    chest: Optional[int] = None
+) -> Question:
+    """Pick a question from the user's deck or the pool, falling back to any difficulty"""
+    question_id = await _pick_question_id(db, difficulty, user_id, exclude_ids or (), topic, chest)
+    if question_id is None:
+        # Fallback: try any difficulty
+        question_id = await question_pool.pick(db, None, user_id)
+
+    question = await db.get(Question, question_id) if question_id is not None else None
+    if question_id is not None and question is None:
+        # Question was removed since the pool was loaded
+        question_pool.invalidate()
+        question_id = await question_pool.pick(db, None, user_id)
+        question = await db.get(Question, question_id) if question_id is not None else None
+
+    if question is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No questions available"
+        )
+    return question
+
 
 @router.get("/random", response_model=QuestionResponse)
 async def get_random_question(
     difficulty: str = Query(..., description="Question difficulty level"),
     exclude_ids: Optional[str] = Query(None, description="Comma-separated list of question IDs to exclude"),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    topic: Optional[str] = Query(None, description="Restrict to a single topic"),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a random question by difficulty, excluding already answered questions"""
     
-    # Build base query
-    query = db.query(Question).filter(Question.difficulty == difficulty)
-    
-    # If user is authenticated, exclude questions they've already answered
-    if current_user:
-        answered_ids = db.query(AnsweredQuestion.question_id).filter(
-            AnsweredQuestion.user_id == current_user.id
-        ).subquery()
-        query = query.filter(~Question.id.in_(answered_ids))
-    
     # Exclude additional IDs if provided
+    ids_to_exclude = []
     if exclude_ids:
         try:
             ids_to_exclude = [int(id.strip()) for id in exclude_ids.split(",") if id.strip()]
-            if ids_to_exclude:
-                query = query.filter(~Question.id.in_(ids_to_exclude))
         except ValueError:
             pass  # Ignore invalid IDs
     
-    # Get all matching questions
-    questions = query.all()
-    
-    if not questions:
-        # Fallback: try any difficulty
-        fallback_query = db.query(Question)
-        if current_user:
-            answered_ids = db.query(AnsweredQuestion.question_id).filter(
-                AnsweredQuestion.user_id == current_user.id
-            ).subquery()
-            fallback_query = fallback_query.filter(~Question.id.in_(answered_ids))
-        
-        questions = fallback_query.all()
+    user_id = current_user.id if current_user else None
+    question = await _load_picked_question(db, difficulty, user_id, ids_to_exclude, topic)
+    return json_response(object_dict(QUESTION_FIELDS, question))
+
+
+@router.get("/adaptive", response_model=QuestionResponse)
+async def get_adaptive_question(
+    exclude_ids: Optional[str] = Query(None, description="Comma-separated list of question IDs to exclude"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the unanswered question whose rating best matches the user's ability"""
+    ids_to_exclude = []
+    if exclude_ids:
+        try:
+            ids_to_exclude = [int(id.strip()) for id in exclude_ids.split(",") if id.strip()]
+        except ValueError:
+            pass  # Ignore invalid IDs
     
-    if not questions:
+    question_id = await adaptive.pick(db, current_user.id, ids_to_exclude)
+    question = await db.get(Question, question_id) if question_id is not None else None
+    if question is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No questions available"
         )
-    
-    # Return random question
-    return random.choice(questions)
+    return json_response(object_dict(QUESTION_FIELDS, question))
 
 
 @router.get("/by-room-chest", response_model=QuestionResponse)
 async def get_question_by_room_chest(
     room: int = Query(..., description="Room number (1-10)"),
     chest: int = Query(..., description="Chest number (1-3)"),
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a question appropriate for the given room and chest number"""
+    user_id = current_user.id if current_user else None
     
-    # Determine difficulty based on room and chest
-    if room <= 3:
-        difficulties = ["easy", "medium", "hard"]
-    elif room <= 6:
-        difficulties = ["medium", "hard", "very_hard"]
-    else:
-        difficulties = ["hard", "very_hard", "expert"]
+    # Serve the question dealt for this chest by /room/{room}, if any
+    if user_id is not None:
+        question_id = await question_pool.reserved(db, user_id, room, chest)
+        question = await db.get(Question, question_id) if question_id is not None else None
+        if question is not None:
+            return json_response(object_dict(QUESTION_FIELDS, question))
     
-    difficulty = difficulties[min(chest - 1, 2)]
+    # Determine difficulty based on room and chest
+    difficulty = _room_difficulties(room)[min(chest - 1, 2)]
     
-    # Build query
-    query = db.query(Question).filter(Question.difficulty == difficulty)
+    question = await _load_picked_question(db, difficulty, user_id, chest=chest)
+    return json_response(object_dict(QUESTION_FIELDS, question))
+
+
+@router.get("/room/{room}", response_model=List[QuestionResponse])
+async def deal_room_questions(
+    room: int = Path(..., ge=1, description="Room number (1-10)"),
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Deal a whole room at once: one question per chest (in chest order), with
+    no duplicates, loaded in a single query. For signed-in users the questions
+    are reserved, so /by-room-chest returns the same ones.
+    """
+    user_id = current_user.id if current_user else None
+    exclude_ids = question_pool.reserved_elsewhere(user_id, room) if user_id is not None else []
     
-    # Exclude answered questions for authenticated users
-    if current_user:
-        answered_ids = db.query(AnsweredQuestion.question_id).filter(
-            AnsweredQuestion.user_id == current_user.id
-        ).subquery()
-        query = query.filter(~Question.id.in_(answered_ids))
-    
-    questions = query.all()
-    
-    if not questions:
-        # Fallback to any difficulty
-        fallback_query = db.query(Question)
-        if current_user:
-            answered_ids = db.query(AnsweredQuestion.question_id).filter(
-                AnsweredQuestion.user_id == current_user.id
-            ).subquery()
-            fallback_query = fallback_query.filter(~Question.id.in_(answered_ids))
-        questions = fallback_query.all()
-    
-    if not questions:
+    # One distinct question per chest (any difficulty as fallback)
+    question_ids = []
+    for chest, difficulty in enumerate(_room_difficulties(room), start=1):
+        excluded = [*exclude_ids, *question_ids]
+        question_id = await _pick_question_id(db, difficulty, user_id, excluded, chest=chest)
+        if question_id is None:
+            question_id = await question_pool.pick(db, None, user_id, excluded)
+        if question_id is None:
+            break  # Pool exhausted for this user
+        question_ids.append(question_id)
+    if not question_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No questions available"
         )
     
-    return random.choice(questions)
+    rows = await db.execute(
+        select(*(getattr(Question, field) for field in QUESTION_FIELDS))
+        .where(Question.id.in_(question_ids))
+    )
+    by_id = {question["id"]: question for question in row_dicts(QUESTION_FIELDS, rows)}
+    if len(by_id) != len(question_ids):
+        # Questions were removed since the pool was loaded
+        question_pool.invalidate()
+    questions = [by_id[question_id] for question_id in question_ids if question_id in by_id]
+    
+    if user_id is not None:
+        question_pool.reserve(user_id, room, [question["id"] for question in questions])
+    return json_response(questions)
 
 
 @router.post("/answered", response_model=AnsweredQuestionResponse)
 async def record_answered_question(
     answer_data: AnswerQuestion,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Record that a user has answered a question"""
     
     # Check if question exists
-    question = db.query(Question).filter(Question.id == answer_data.question_id).first()
+    question = await db.get(Question, answer_data.question_id)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -135,19 +217,26 @@ async def record_answered_question(
         )
     
     # Check if already answered
-    existing = db.query(AnsweredQuestion).filter(
+    existing = await db.scalar(select(AnsweredQuestion).where(
         AnsweredQuestion.user_id == current_user.id,
         AnsweredQuestion.question_id == answer_data.question_id
-    ).first()
+    ))
     
     if existing:
         # Update existing record
         existing.answered_correctly = answer_data.answered_correctly
         if answer_data.room_number:
             existing.room_number = answer_data.room_number
-        db.commit()
-        db.refresh(existing)
-        return existing
+        await db.commit()
+        await db.refresh(existing)
+        mark_write(current_user.id)
+        answer_versions.bump(current_user.id)
+        question_pool.mark_answered(current_user.id, existing.question_id)
+        analytics.record(
+            question.id, question.topic, question.difficulty, existing.room_number, existing.answered_correctly
+        )
+        adaptive.record(current_user.id, [(existing.question_id, existing.answered_correctly)])
+        return json_response(object_dict(ANSWERED_FIELDS, existing))
     
     # Create new record
     answered = AnsweredQuestion(
@@ -157,48 +246,172 @@ async def record_answered_question(
         room_number=answer_data.room_number
     )
     db.add(answered)
-    db.commit()
-    db.refresh(answered)
+    await db.commit()
+    await db.refresh(answered)
+    mark_write(current_user.id)
+    answer_versions.bump(current_user.id)
+    question_pool.mark_answered(current_user.id, answered.question_id)
+    analytics.record(
+        question.id, question.topic, question.difficulty, answered.room_number, answered.answered_correctly
+    )
+    adaptive.record(current_user.id, [(answered.question_id, answered.answered_correctly)])
     
-    return answered
+    return json_response(object_dict(ANSWERED_FIELDS, answered))
+
+
+@router.post("/answered/batch", response_model=List[AnsweredQuestionResponse])
+async def record_answered_questions_batch(
+    batch: AnswerBatch,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Record many answers at once (e.g. replaying answers queued offline).
+    Validates and upserts them in one transaction. Like the single endpoint
+    it leaves the progress counters alone: the client owns those and saves
+    them with its progress.
+    """
+    # Later answers for the same question win
+    answers = {answer.question_id: answer for answer in batch.answers}
+    if not answers:
+        return []
+    
+    # Validate ids and read the rollup buckets in a single query
+    rows = await db.execute(
+        select(Question.id, Question.topic, Question.difficulty).where(Question.id.in_(answers))
+    )
+    buckets = {question_id: (topic, difficulty) for question_id, topic, difficulty in rows}
+    
+    missing = sorted(set(answers) - set(buckets))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Questions not found: {', '.join(map(str, missing))}"
+        )
+    
+    values = [
+        {
+            "user_id": current_user.id,
+            "question_id": answer.question_id,
+            "answered_correctly": answer.answered_correctly,
+            "room_number": answer.room_number,
+        }
+        for answer in answers.values()
+    ]
+    
+    insert = upsert_insert(db)
+    if insert is not None:
+        stmt = insert(AnsweredQuestion).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AnsweredQuestion.user_id, AnsweredQuestion.question_id],
+            set_={
+                "answered_correctly": stmt.excluded.answered_correctly,
+                "room_number": func.coalesce(stmt.excluded.room_number, AnsweredQuestion.room_number),
+            }
+        ).returning(AnsweredQuestion)
+        recorded = (await db.scalars(stmt, execution_options={"populate_existing": True})).all()
+    else:
+        recorded = []
+        for row in values:
+            existing = await db.scalar(select(AnsweredQuestion).where(
+                AnsweredQuestion.user_id == current_user.id,
+                AnsweredQuestion.question_id == row["question_id"]
+            ))
+            if existing is None:
+                existing = AnsweredQuestion(**row)
+                db.add(existing)
+            else:
+                existing.answered_correctly = row["answered_correctly"]
+                if row["room_number"]:
+                    existing.room_number = row["room_number"]
+            recorded.append(existing)
+        await db.flush()
+    
+    await db.commit()
+    mark_write(current_user.id)
+    answer_versions.bump(current_user.id)
+    
+    for question_id, answer in answers.items():
+        question_pool.mark_answered(current_user.id, question_id)
+        analytics.record(question_id, *buckets[question_id], answer.room_number, answer.answered_correctly)
+    adaptive.record(current_user.id, [
+        (question_id, answer.answered_correctly) for question_id, answer in answers.items()
+    ])
+    
+    return json_response([object_dict(ANSWERED_FIELDS, row) for row in recorded])
 
 
 @router.get("/answered", response_model=List[AnsweredQuestionResponse])
 async def get_answered_questions(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all questions answered by the current user"""
-    answered = db.query(AnsweredQuestion).filter(
-        AnsweredQuestion.user_id == current_user.id
-    ).all()
-    return answered
+    async def build():
+        # Plain row tuples: no ORM identity map or Pydantic models involved
+        rows = await db.execute(
+            select(*(getattr(AnsweredQuestion, field) for field in ANSWERED_FIELDS))
+            .where(AnsweredQuestion.user_id == current_user.id)
+        )
+        return row_dicts(ANSWERED_FIELDS, rows)
+    
+    key = ("answered", current_user.id, answer_versions.get(current_user.id))
+    return await response_cache.respond(request, key, build, private=True)
 
 
 @router.get("/stats")
 async def get_question_stats(
-    current_user: Optional[User] = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: Optional[CurrentUser] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get statistics about available questions"""
-    total_questions = db.query(func.count(Question.id)).scalar()
+    await question_pool.refresh(db)
+    if current_user:
+        key = ("stats", question_pool.version, current_user.id, answer_versions.get(current_user.id))
+    else:
+        key = ("stats", question_pool.version)
+    
+    async def build():
+        return await _question_stats(db, current_user)
+    
+    return await response_cache.respond(request, key, build, private=current_user is not None)
+
+
+async def _question_stats(db: AsyncSession, current_user: Optional[CurrentUser]) -> dict:
+    bank = await question_pool.bank_stats(db)
+    total_questions = bank["total_questions"]
     
-    # Count by difficulty
-    difficulties = {}
-    for diff in ["easy", "medium", "hard", "very_hard", "expert"]:
-        count = db.query(func.count(Question.id)).filter(Question.difficulty == diff).scalar()
-        difficulties[diff] = count
+    # Count by difficulty (always report every tier)
+    difficulties = {diff: 0 for diff in DIFFICULTIES}
+    difficulties.update(bank["by_difficulty"])
     
     result = {
         "total_questions": total_questions,
-        "by_difficulty": difficulties
+        "by_difficulty": difficulties,
+        "by_topic": bank["by_topic"]
     }
     
     if current_user:
-        answered_count = db.query(func.count(AnsweredQuestion.id)).filter(
-            AnsweredQuestion.user_id == current_user.id
-        ).scalar()
+        # One grouped query for the user's answers by difficulty and topic
+        rows = await db.execute(
+            select(Question.difficulty, Question.topic, func.count(AnsweredQuestion.id))
+            .join(Question, Question.id == AnsweredQuestion.question_id)
+            .where(AnsweredQuestion.user_id == current_user.id)
+            .group_by(Question.difficulty, Question.topic)
+        )
+        answered_count = 0
+        answered_by_difficulty = {diff: 0 for diff in DIFFICULTIES}
+        answered_by_topic = {}
+        for difficulty, topic, count in rows:
+            answered_count += count
+            answered_by_difficulty[difficulty] = answered_by_difficulty.get(difficulty, 0) + count
+            answered_by_topic[topic] = answered_by_topic.get(topic, 0) + count
+        
         result["answered_by_user"] = answered_count
         result["remaining"] = total_questions - answered_count
+        result["answered_by_difficulty"] = answered_by_difficulty
+        result["answered_by_topic"] = answered_by_topic
     
     return result
@@ -3,28 +3,32 @@
 # ========================================
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
 from database import get_db
 from models import User, GameProgress
 from schemas import UserCreate, UserLogin, UserResponse, Token
 from auth import (
-    get_password_hash,
-    verify_password,
+    password_hasher,
+    needs_rehash,
     create_access_token,
+    invalidate_user,
     get_current_user,
+    CurrentUser,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from rankings import leaderboard
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=Token)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user account"""
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,7 +36,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,20 +44,21 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
         password_hash=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create initial game progress
     game_progress = GameProgress(user_id=new_user.id)
     db.add(game_progress)
-    db.commit()
+    await db.commit()
+    leaderboard.update(new_user.id, new_user.username, 0, 1, False)
     
     # Generate access token
     access_token = create_access_token(
@@ -65,20 +70,25 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return access token"""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await password_hasher.verify(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade the stored hash if the configured cost factor changed
+    if needs_rehash(user.password_hash):
+        user.password_hash = await password_hasher.hash(credentials.password)
+        invalidate_user(user.id)
+    
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     # Generate access token
     access_token = create_access_token(
@@ -90,12 +100,12 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/profile", response_model=UserResponse)
-async def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(current_user: CurrentUser = Depends(get_current_user)):
     """Get current user's profile"""
     return current_user
 
 
 @router.get("/check")
-async def check_auth(current_user: User = Depends(get_current_user)):
+async def check_auth(current_user: CurrentUser = Depends(get_current_user)):
     """Check if user is authenticated"""
     return {"authenticated": True, "user_id": current_user.id, "username": current_user.username}
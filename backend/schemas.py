@@ -2,10 +2,13 @@
 # DATA SCIENCE DUNGEON - PYDANTIC SCHEMAS
 # ========================================
 
-from pydantic import BaseModel, EmailStr
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+# Most answers accepted by one /questions/answered/batch call
+MAX_ANSWER_BATCH = 100
+
 
 # ==================== USER SCHEMAS ====================
 
@@ -37,6 +40,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: Optional[int] = None
+    exp: Optional[int] = None
 
 
 # ==================== GAME PROGRESS SCHEMAS ====================
@@ -61,6 +65,11 @@ class GameProgressUpdate(BaseModel):
     chest_states: Optional[Any] = None
 
 
+class ChestOpen(BaseModel):
+    room: int
+    chest: int
+
+
 class GameProgressResponse(BaseModel):
     id: int
     user_id: int
@@ -95,12 +104,44 @@ class QuestionResponse(BaseModel):
         from_attributes = True
 
 
+class QuestionImport(BaseModel):
+    question_text: str
+    option_a: str
+    option_b: str
+    option_c: str
+    option_d: str
+    correct_answer: str
+    difficulty: str
+    topic: str
+    explanation: Optional[str] = None
+
+    @field_validator("correct_answer")
+    @classmethod
+    def check_answer(cls, value: str) -> str:
+        value = value.strip().upper()
+        if value not in ("A", "B", "C", "D"):
+            raise ValueError("correct_answer must be one of A, B, C, D")
+        return value
+
+    @field_validator("difficulty")
+    @classmethod
+    def check_difficulty(cls, value: str) -> str:
+        value = value.strip().lower()
+        if value not in ("easy", "medium", "hard", "very_hard", "expert"):
+            raise ValueError("unknown difficulty")
+        return value
+
+
 class AnswerQuestion(BaseModel):
     question_id: int
     answered_correctly: bool
     room_number: Optional[int] = None
 
 
+class AnswerBatch(BaseModel):
+    answers: List[AnswerQuestion] = Field(..., max_length=MAX_ANSWER_BATCH)
+
+
 class AnsweredQuestionResponse(BaseModel):
     id: int
     question_id: int
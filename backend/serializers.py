@@ -0,0 +1,72 @@
+# ========================================
+# DATA SCIENCE DUNGEON - FAST JSON SERIALIZERS
+# ========================================
+"""
+Fast JSON path for hot responses.
+
+Rows and snapshots are turned straight into plain dicts with the same fields
+as the response models in schemas.py and encoded with orjson, skipping the
+ORM -> Pydantic validation and jsonable_encoder pass FastAPI would otherwise
+run on every response. Set FAST_JSON=0 to fall back to the standard library
+encoder (the output is the same JSON).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import json
+import os
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from chests import chest_states_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+FAST_JSON = os.getenv("FAST_JSON", "1") != "0" and orjson is not None
+
+# Field order of the matching response models
+QUESTION_FIELDS = (
+    "id",
+    "question_text",
+    "option_a",
+    "option_b",
+    "option_c",
+    "option_d",
+    "correct_answer",
+    "difficulty",
+    "topic",
+    "explanation",
+)
+ANSWERED_FIELDS = ("id", "question_id", "answered_correctly", "answered_at", "room_number")
+
+
+def dumps(data: Any) -> bytes:
+    """Encode JSON-compatible data (dicts, lists, datetimes) to bytes"""
+    if FAST_JSON:
+        return orjson.dumps(data)
+    return json.dumps(jsonable_encoder(data), separators=(",", ":")).encode()
+
+
+def json_response(data: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Pre-serialized JSON response; FastAPI does not re-validate it"""
+    return Response(content=dumps(data), media_type="application/json", headers=headers)
+
+
+def row_dicts(fields: Sequence[str], rows: Iterable[tuple]) -> List[dict]:
+    """Zip selected row tuples with their field names"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def object_dict(fields: Sequence[str], obj: Any) -> dict:
+    """Pick response fields from an ORM object"""
+    return {field: getattr(obj, field) for field in fields}
+
+
+def progress_dict(snapshot: dict) -> dict:
+    """GameProgressResponse fields for a progress snapshot (see progress_buffer)"""
+    data = dict(snapshot)
+    data["chest_states"] = chest_states_json(data.pop("opened_chests") or 0)
+    return data
@@ -0,0 +1,216 @@
+# ========================================
+# DATA SCIENCE DUNGEON - STATIC ASSET PIPELINE
+# ========================================
+"""
+Fingerprinted, pre-compressed static assets served from memory.
+
+At startup every file under /js, /assets plus styles.css is read once and
+given a content-hashed name (js/game.3f2a1b9c0d.js). References to other
+assets inside CSS/JS and the script/link tags in index.html are rewritten to
+the hashed names, and text files get gzip (and brotli, when the brotli
+package is installed) variants.
+
+An ASGI middleware answers GET/HEAD for known paths straight from memory:
+hashed names with an immutable one-year Cache-Control, original names and
+index.html with no-cache plus an ETag. The encoding is negotiated from
+Accept-Encoding. Unknown paths fall through to the regular routes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_ASSETS_ENABLED = os.getenv("STATIC_ASSETS_ENABLED", "1") != "0"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+TEXT_TYPES = {".js", ".css", ".html", ".svg", ".json", ".txt"}
+ASSET_DIRS = ("assets", "js")  # Binary assets first: JS/CSS refer to them
+ASSET_FILES = ("styles.css",)
+
+# Quoted or url()-wrapped relative paths, with an optional ?v= cache buster
+REFERENCE = re.compile(r"""(?P<open>["'(])(?P<path>[\w./-]+)(?:\?[^"')]*)?(?P<close>["')])""")
+
+
+@dataclass
+class Asset:
+    """One servable file with its precomputed variants"""
+    content_type: str
+    etag: str
+    cache_control: str
+    bodies: Dict[str, bytes] = field(default_factory=dict)  # encoding -> body
+
+
+def hashed_name(path: str, digest: str) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest}{ext}"
+
+
+def content_type_for(path: str) -> str:
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def compress_variants(path: str, body: bytes) -> Dict[str, bytes]:
+    """identity plus any compressed encodings that are actually smaller"""
+    bodies = {"identity": body}
+    if os.path.splitext(path)[1] not in TEXT_TYPES:
+        return bodies  # PNGs etc. are already compressed
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gzipped) < len(body):
+        bodies["gzip"] = gzipped
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        if len(compressed) < len(body):
+            bodies["br"] = compressed
+    return bodies
+
+
+def negotiate(accept_encoding: str, available) -> str:
+    """Pick br, then gzip, then identity according to Accept-Encoding"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+class AssetStore:
+    """Builds the manifest and the in-memory asset table"""
+
+    def __init__(self):
+        self.assets: Dict[str, Asset] = {}   # URL path -> asset
+        self.manifest: Dict[str, str] = {}   # "js/game.js" -> "js/game.3f2a1b9c0d.js"
+
+    def build(self, root: str):
+        """Read, fingerprint, rewrite and compress everything under root"""
+        assets: Dict[str, Asset] = {}
+        manifest: Dict[str, str] = {}
+
+        for path in self._collect(root):
+            with open(os.path.join(root, path), "rb") as f:
+                body = f.read()
+            if os.path.splitext(path)[1] in TEXT_TYPES:
+                body = self._rewrite(body, manifest)
+
+            digest = hashlib.sha256(body).hexdigest()[:10]
+            manifest[path] = hashed_name(path, digest)
+            content_type = content_type_for(path)
+            bodies = compress_variants(path, body)
+            assets["/" + manifest[path]] = Asset(content_type, f'"{digest}"', IMMUTABLE, bodies)
+            assets["/" + path] = Asset(content_type, f'"{digest}"', REVALIDATE, bodies)
+
+        index_path = os.path.join(root, "index.html")
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                body = self._rewrite(f.read(), manifest)
+            index = Asset(
+                content_type_for(index_path),
+                f'"{hashlib.sha256(body).hexdigest()[:10]}"',
+                REVALIDATE,
+                compress_variants(index_path, body)
+            )
+            assets["/"] = assets["/index.html"] = index
+
+        self.assets = assets
+        self.manifest = manifest
+
+    @staticmethod
+    def _collect(root: str) -> List[str]:
+        paths = []
+        for directory in ASSET_DIRS:
+            base = os.path.join(root, directory)
+            for dirpath, _, filenames in sorted(os.walk(base)):
+                for filename in sorted(filenames):
+                    full = os.path.join(dirpath, filename)
+                    paths.append(os.path.relpath(full, root).replace(os.sep, "/"))
+        paths.extend(name for name in ASSET_FILES if os.path.exists(os.path.join(root, name)))
+        return paths
+
+    @staticmethod
+    def _rewrite(body: bytes, manifest: Dict[str, str]) -> bytes:
+        """Point references at already fingerprinted files"""
+        def replace(match: re.Match) -> str:
+            hashed = manifest.get(match.group("path"))
+            if hashed is None:
+                return match.group(0)
+            return f"{match.group('open')}{hashed}{match.group('close')}"
+
+        return REFERENCE.sub(replace, body.decode("utf-8")).encode("utf-8")
+
+    def stats(self) -> dict:
+        unique = {id(asset.bodies): asset.bodies for asset in self.assets.values()}.values()
+        return {
+            "files": len(self.manifest),
+            "identity_bytes": sum(len(bodies["identity"]) for bodies in unique),
+            "gzip_bytes": sum(len(bodies.get("gzip", bodies["identity"])) for bodies in unique),
+            "brotli": brotli is not None,
+        }
+
+
+class StaticAssetMiddleware:
+    """Serves known asset paths from memory; everything else passes through"""
+
+    def __init__(self, app, store: AssetStore):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        asset: Optional[Asset] = None
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            asset = self.store.assets.get(scope["path"])
+        if asset is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        encoding = negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"), asset.bodies)
+        etag = asset.etag if encoding == "identity" else f'{asset.etag[:-1]}-{encoding}"'
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"cache-control", asset.cache_control.encode()),
+            (b"etag", etag.encode()),
+            (b"vary", b"Accept-Encoding"),
+        ]
+
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        if etag in (candidate.strip() for candidate in if_none_match.split(",")):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = asset.bodies[encoding]
+        headers.append((b"content-type", asset.content_type.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+# Shared store for the application (built in the app lifespan)
+asset_store = AssetStore()
@@ -0,0 +1,103 @@
+# ========================================
+# DATA SCIENCE DUNGEON - TEST FIXTURES
+# ========================================
+"""
+Shared fixtures: a throwaway SQLite database and helpers to run coroutines.
+
+DATABASE_URL is set before any backend module is imported, so the engines
+in database.py point at the temporary file. Each test gets fresh tables.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DB_DIR = tempfile.mkdtemp(prefix="dungeon-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DB_DIR, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+sys.path.insert(0, BACKEND_DIR)
+
+from database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from models import Question, User  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Fresh tables and a sync session for seeding and assertions"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a new event loop, closing the async connections after"""
+    def runner(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(main())
+    return runner
+
+
+def add_questions(session, specs):
+    """Insert questions from (difficulty, topic) pairs; returns their ids"""
+    questions = [
+        Question(
+            question_text=f"Question {index}?",
+            option_a="A",
+            option_b="B",
+            option_c="C",
+            option_d="D",
+            correct_answer="A",
+            difficulty=difficulty,
+            topic=topic,
+        )
+        for index, (difficulty, topic) in enumerate(specs)
+    ]
+    session.add_all(questions)
+    session.commit()
+    return [question.id for question in questions]
+
+
+def add_user(session, username: str = "player") -> int:
+    user = User(username=username, email=f"{username}@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+@pytest.fixture
+def client(db):
+    """TestClient running the app lifespan against the fresh tables"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from progress_buffer import progress_buffer
+    from question_pool import question_pool
+
+    # Module singletons outlive a test; start each one from a clean slate
+    progress_buffer._snapshots.clear()
+    progress_buffer._dirty.clear()
+    question_pool.invalidate()
+    question_pool._answered.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def auth_headers(user_id: int) -> dict:
+    from auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
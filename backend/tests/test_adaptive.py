@@ -0,0 +1,131 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ADAPTIVE DIFFICULTY TESTS
+# ========================================
+
+import subprocess
+import sys
+
+import pytest
+
+import adaptive as adaptive_module
+from adaptive import (
+    BASE_RATING, PLAYER_K, QUESTION_K, TARGET_OFFSET, TARGET_SUCCESS, TIER_RATINGS,
+    AdaptiveEngine, expected_score, rating_for_success,
+)
+from database import AsyncSessionLocal
+from models import AnsweredQuestion
+from question_pool import QuestionPool
+
+from .conftest import BACKEND_DIR, add_questions, add_user
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh question pool for the engine to align with"""
+    pool = QuestionPool()
+    monkeypatch.setattr(adaptive_module, "question_pool", pool)
+    return pool
+
+
+async def _pick(engine: AdaptiveEngine, user_id: int, exclude_ids=(), offset: float = 0.0):
+    async with AsyncSessionLocal() as session:
+        return await engine.pick(session, user_id, exclude_ids, offset)
+
+
+def test_elo_curve():
+    assert expected_score(1200.0, 1200.0) == pytest.approx(0.5)
+    assert expected_score(1600.0, 1200.0) == pytest.approx(10 / 11)
+    assert rating_for_success(0.5, 1300.0) == pytest.approx(1300.0)
+    assert expected_score(1000.0, 1000.0 + TARGET_OFFSET) == pytest.approx(TARGET_SUCCESS)
+
+
+def test_unanswered_questions_keep_their_tier_rating(db, run, pool):
+    ids = add_questions(db, [("easy", "stats"), ("expert", "ml")])
+    engine = AdaptiveEngine()
+
+    async def load():
+        async with AsyncSessionLocal() as session:
+            await engine.ensure_loaded(session)
+
+    run(load())
+    ratings = dict(zip(engine.question_ids.tolist(), engine.ratings.tolist()))
+    assert ratings[ids[0]] == pytest.approx(TIER_RATINGS["easy"])
+    assert ratings[ids[1]] == pytest.approx(TIER_RATINGS["expert"])
+
+
+def test_record_moves_player_and_question_ratings(db, run, pool):
+    ids = add_questions(db, [("medium", "stats")] * 2)
+    user_id = add_user(db)
+    engine = AdaptiveEngine()
+    run(_pick(engine, user_id))  # Loads the ratings and the player
+
+    slot = pool.slots[ids[0]]
+    question_before = engine.ratings[slot]
+    player_before = engine._players[user_id]
+    surprise = 1.0 - expected_score(player_before, question_before)
+
+    engine.record(user_id, [(ids[0], True)])
+
+    assert engine._players[user_id] == pytest.approx(player_before + PLAYER_K * surprise)
+    assert engine.ratings[slot] == pytest.approx(question_before - QUESTION_K * surprise)
+    assert (engine.attempts[slot], engine.correct[slot]) == (1, 1)
+
+
+def test_record_is_a_no_op_until_loaded(db, run, pool):
+    ids = add_questions(db, [("easy", "stats")])
+    user_id = add_user(db)
+    engine = AdaptiveEngine()
+
+    engine.record(user_id, [(ids[0], True)])
+    assert engine.updates == 0 and engine.ratings is None
+
+    # Loaded ratings, but a player not seen yet: seeded from history later
+    run(_pick(engine, add_user(db, "other")))
+    engine.record(user_id, [(ids[0], True)])
+    assert engine.updates == 0
+    assert user_id not in engine._players
+
+
+def test_player_is_seeded_from_history(db, run, pool):
+    ids = add_questions(db, [("hard", "stats")] * 3)
+    user_id = add_user(db)
+    db.add_all(AnsweredQuestion(user_id=user_id, question_id=question_id, answered_correctly=True) for question_id in ids[:2])
+    db.commit()
+    engine = AdaptiveEngine()
+
+    assert run(_pick(engine, user_id)) == ids[2]
+    assert engine._players[user_id] > BASE_RATING
+
+
+def test_pick_masks_answered_and_excluded(db, run, pool):
+    ids = add_questions(db, [("easy", "stats"), ("medium", "stats"), ("hard", "stats"), ("expert", "stats")])
+    user_id = add_user(db)
+    db.add(AnsweredQuestion(user_id=user_id, question_id=ids[2], answered_correctly=False))
+    db.commit()
+    engine = AdaptiveEngine()
+
+    picks = {run(_pick(engine, user_id, [ids[1]], offset)) for offset in (-600.0, 0.0, 600.0)}
+    assert picks <= {ids[0], ids[3]}
+    # Shifting the target far up or down reaches the hardest/easiest left
+    assert run(_pick(engine, user_id, [ids[1]], 2000.0)) == ids[3]
+    assert run(_pick(engine, user_id, [ids[1]], -2000.0)) == ids[0]
+    assert run(_pick(engine, user_id, [ids[0], ids[1], ids[3]])) is None
+
+
+def test_players_are_bounded(db, run, pool, monkeypatch):
+    monkeypatch.setattr(adaptive_module, "POOL_MAX_USERS", 2)
+    add_questions(db, [("easy", "stats")])
+    users = [add_user(db, f"player{index}") for index in range(3)]
+    engine = AdaptiveEngine()
+
+    for user_id in users:
+        run(_pick(engine, user_id))
+    assert list(engine._players) == users[1:]
+
+
+def test_numpy_is_imported_lazily():
+    code = "import sys, main; print('numpy' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
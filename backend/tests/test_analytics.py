@@ -0,0 +1,122 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ANSWER ANALYTICS TESTS
+# ========================================
+
+from datetime import date, datetime, timedelta
+
+from analytics import ANALYTICS_DAILY_DAYS, AnswerAnalytics
+from database import AsyncSessionLocal
+from models import AnsweredQuestion, AnswerRollup
+
+from .conftest import add_questions, add_user
+
+
+def _rollups(db) -> dict:
+    db.expire_all()
+    return {
+        (row.dimension, row.bucket, row.day): (row.attempts, row.correct)
+        for row in db.query(AnswerRollup)
+    }
+
+
+def test_backfill_aggregates_the_answer_log(db, run):
+    ids = add_questions(db, [("easy", "stats"), ("hard", "ml")])
+    users = [add_user(db, name) for name in ("a", "b")]
+    day = datetime(2026, 3, 14, 12, 0)
+    db.add_all([
+        AnsweredQuestion(user_id=users[0], question_id=ids[0], answered_correctly=True, answered_at=day, room_number=1),
+        AnsweredQuestion(user_id=users[1], question_id=ids[0], answered_correctly=False, answered_at=day, room_number=1),
+        AnsweredQuestion(user_id=users[0], question_id=ids[1], answered_correctly=True, answered_at=day),
+    ])
+    db.commit()
+    analytics = AnswerAnalytics(10)
+
+    assert run(analytics.backfill()) is True
+    rollups = _rollups(db)
+    today = day.date()
+    assert rollups == {
+        ("question", str(ids[0]), today): (2, 1),
+        ("question", str(ids[1]), today): (1, 1),
+        ("topic", "stats", today): (2, 1),
+        ("topic", "ml", today): (1, 1),
+        ("difficulty", "easy", today): (2, 1),
+        ("difficulty", "hard", today): (1, 1),
+        ("room", "1", today): (2, 1),  # Answers without a room are left out
+        ("total", "", today): (3, 2),
+    }
+
+    # Only empty rollups are backfilled
+    assert run(analytics.backfill()) is False
+    assert analytics.backfilled == 1
+
+
+def test_backfill_skips_an_empty_log(db, run):
+    assert run(AnswerAnalytics(10).backfill()) is False
+    assert _rollups(db) == {}
+
+
+def test_recorded_answers_are_flushed_as_increments(db, run):
+    analytics = AnswerAnalytics(10)
+    today = datetime.utcnow().date()
+
+    async def scenario():
+        analytics.record(5, "stats", "easy", 2, True)
+        analytics.record(5, "stats", "easy", None, False)
+        await analytics.flush()
+        analytics.record(5, "stats", "easy", 2, True)
+        await analytics.flush()
+
+    run(scenario())
+    rollups = _rollups(db)
+    assert rollups[("question", "5", today)] == (3, 2)
+    assert rollups[("room", "2", today)] == (2, 2)
+    assert rollups[("total", "", today)] == (3, 2)
+    assert analytics.flushes == 2 and analytics.version == 2
+
+
+def test_compaction_merges_old_days_into_months(db, run):
+    old_month = (datetime.utcnow().date() - timedelta(days=ANALYTICS_DAILY_DAYS + 60)).replace(day=1)
+    recent = datetime.utcnow().date()
+    db.add_all([
+        AnswerRollup(dimension="total", bucket="", day=old_month, attempts=1, correct=1),  # Earlier compaction
+        AnswerRollup(dimension="total", bucket="", day=old_month + timedelta(days=1), attempts=2, correct=1),
+        AnswerRollup(dimension="total", bucket="", day=old_month + timedelta(days=9), attempts=3, correct=0),
+        AnswerRollup(dimension="topic", bucket="ml", day=old_month + timedelta(days=9), attempts=4, correct=4),
+        AnswerRollup(dimension="total", bucket="", day=recent, attempts=5, correct=5),
+    ])
+    db.commit()
+    analytics = AnswerAnalytics(10)
+
+    run(analytics.compact())
+    assert _rollups(db) == {
+        ("total", "", old_month): (6, 2),
+        ("topic", "ml", old_month): (4, 4),
+        ("total", "", recent): (5, 5),
+    }
+    assert analytics.compacted == 3
+
+    run(analytics.compact())  # Nothing left to merge
+    assert analytics.compacted == 3
+
+
+def test_summary_orders_by_failures(db, run):
+    today = datetime.utcnow().date()
+    db.add_all([
+        AnswerRollup(dimension="topic", bucket="stats", day=today, attempts=10, correct=9),
+        AnswerRollup(dimension="topic", bucket="ml", day=today, attempts=4, correct=1),
+        AnswerRollup(dimension="topic", bucket="ml", day=date(2020, 1, 1), attempts=2, correct=0),
+    ])
+    db.commit()
+    analytics = AnswerAnalytics(10)
+
+    async def summaries():
+        async with AsyncSessionLocal() as session:
+            return (
+                await analytics.summary(session, "topic"),
+                await analytics.summary(session, "topic", days=7, order="attempts"),
+            )
+
+    all_time, last_week = run(summaries())
+    assert [(entry["key"], entry["attempts"], entry["incorrect"]) for entry in all_time] == [("ml", 6, 5), ("stats", 10, 1)]
+    assert all_time[0]["success_rate"] == round(1 / 6, 4)
+    assert [entry["key"] for entry in last_week] == ["stats", "ml"]
@@ -0,0 +1,89 @@
+# ========================================
+# DATA SCIENCE DUNGEON - ANSWER RECORDING TESTS
+# ========================================
+
+from models import AnsweredQuestion
+from schemas import MAX_ANSWER_BATCH
+
+from .conftest import add_questions, add_user, auth_headers
+
+
+def _answer(question_id: int, correct: bool, room: int = 1) -> dict:
+    return {"question_id": question_id, "answered_correctly": correct, "room_number": room}
+
+
+def _counters(client, headers) -> tuple:
+    progress = client.get("/api/progress", headers=headers).json()
+    return progress["total_correct"], progress["total_incorrect"]
+
+
+def test_batch_upserts_answers_last_one_wins(client, db):
+    ids = add_questions(db, [("easy", "stats")] * 4)
+    headers = auth_headers(add_user(db))
+
+    client.post("/api/questions/answered/batch", headers=headers, json={"answers": [
+        _answer(ids[0], True),
+        _answer(ids[1], False),
+    ]})
+    response = client.post("/api/questions/answered/batch", headers=headers, json={"answers": [
+        _answer(ids[1], True),
+        _answer(ids[2], True),
+        _answer(ids[2], False),
+    ]})
+    assert response.status_code == 200
+    assert sorted(row["question_id"] for row in response.json()) == ids[1:3]
+
+    db.expire_all()
+    stored = {row.question_id: row.answered_correctly for row in db.query(AnsweredQuestion)}
+    assert stored == {ids[0]: True, ids[1]: True, ids[2]: False}
+
+
+def test_batch_replay_does_not_recount_saved_totals(client, db):
+    ids = add_questions(db, [("easy", "stats")] * 2)
+    headers = auth_headers(add_user(db))
+    assert client.post("/api/progress", json={}, headers=headers).status_code == 200
+
+    # The client counts the answers itself and saves its totals; the failed
+    # answer POSTs are replayed afterwards
+    response = client.put("/api/progress", headers=headers, json={"total_correct": 1, "total_incorrect": 1})
+    assert response.status_code == 200
+    response = client.post("/api/questions/answered/batch", headers=headers, json={"answers": [
+        _answer(ids[0], True),
+        _answer(ids[1], False),
+    ]})
+    assert response.status_code == 200
+
+    assert _counters(client, headers) == (1, 1)
+
+
+def test_batch_keeps_room_when_re_answer_has_none(client, db):
+    ids = add_questions(db, [("easy", "stats")])
+    headers = auth_headers(add_user(db))
+
+    client.post("/api/questions/answered/batch", headers=headers, json={"answers": [_answer(ids[0], False, 4)]})
+    client.post("/api/questions/answered/batch", headers=headers, json={"answers": [_answer(ids[0], True, None)]})
+
+    db.expire_all()
+    row = db.query(AnsweredQuestion).one()
+    assert (row.answered_correctly, row.room_number) == (True, 4)
+
+
+def test_batch_rejects_unknown_questions_without_writing(client, db):
+    ids = add_questions(db, [("easy", "stats")])
+    headers = auth_headers(add_user(db))
+
+    response = client.post("/api/questions/answered/batch", headers=headers, json={"answers": [
+        _answer(ids[0], True),
+        _answer(ids[0] + 100, True),
+    ]})
+    assert response.status_code == 404
+    assert db.query(AnsweredQuestion).count() == 0
+
+
+def test_batch_size_is_limited(client, db):
+    ids = add_questions(db, [("easy", "stats")])
+    headers = auth_headers(add_user(db))
+
+    answers = [_answer(ids[0], True)] * (MAX_ANSWER_BATCH + 1)
+    response = client.post("/api/questions/answered/batch", headers=headers, json={"answers": answers})
+    assert response.status_code == 422
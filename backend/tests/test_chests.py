@@ -0,0 +1,102 @@
+# ========================================
+# DATA SCIENCE DUNGEON - CHEST BITMASK TESTS
+# ========================================
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+from chests import MAX_ROOMS, chest_bit, chest_states_json, decode_chests, encode_chests
+from database import engine
+from migrations import apply_migrations
+
+from .conftest import add_user, auth_headers
+
+# game_progress as created before opened_chests replaced chest_states
+OLD_GAME_PROGRESS = """
+CREATE TABLE game_progress (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES users(id),
+    current_room INTEGER,
+    brightness_level INTEGER,
+    total_correct INTEGER,
+    total_incorrect INTEGER,
+    score INTEGER,
+    game_completed BOOLEAN,
+    chest_states TEXT,
+    last_saved DATETIME
+)
+"""
+
+
+def test_encode_decode_round_trip():
+    chests = [{"room": 1, "chest": 1}, {"room": 1, "chest": 3}, {"room": 10, "chest": 2}]
+    mask = encode_chests(chests)
+
+    assert mask == 0b1 | 0b100 | 1 << 28
+    assert decode_chests(mask) == chests
+    assert json.loads(chest_states_json(mask)) == chests
+
+
+def test_encode_ignores_malformed_entries_and_duplicates():
+    chests = [
+        {"room": 2, "chest": 1},
+        {"room": 2, "chest": 1},
+        {"room": "3", "chest": "2"},
+        {"room": 0, "chest": 1},
+        {"room": 1, "chest": 4},
+        {"room": 1},
+        "chest",
+    ]
+    assert decode_chests(encode_chests(chests)) == [{"room": 2, "chest": 1}, {"room": 3, "chest": 2}]
+    assert encode_chests(None) == 0
+    assert decode_chests(None) == []
+
+
+def test_chest_bit_range():
+    assert chest_bit(MAX_ROOMS, 3) < 1 << 63
+    with pytest.raises(ValueError):
+        chest_bit(MAX_ROOMS + 1, 1)
+    with pytest.raises(ValueError):
+        chest_bit(1, 0)
+
+
+def test_migration_backfills_bitmask_from_chest_states(db):
+    users = [add_user(db, name) for name in ("old", "empty", "broken")]
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE game_progress"))
+        conn.execute(text(OLD_GAME_PROGRESS))
+        conn.execute(
+            text("INSERT INTO game_progress (user_id, chest_states) VALUES (:user_id, :chest_states)"),
+            [
+                {"user_id": users[0], "chest_states": json.dumps([{"room": 1, "chest": 2}, {"room": 4, "chest": 3}])},
+                {"user_id": users[1], "chest_states": None},
+                {"user_id": users[2], "chest_states": "not json"},
+            ]
+        )
+
+    with engine.begin() as conn:
+        apply_migrations(conn)
+        masks = dict(conn.execute(text("SELECT user_id, opened_chests FROM game_progress")).all())
+
+    assert masks == {users[0]: chest_bit(1, 2) | chest_bit(4, 3), users[1]: 0, users[2]: 0}
+
+
+def test_chest_states_round_trip_through_the_api(client, db):
+    headers = auth_headers(add_user(db))
+    chests = [{"room": 1, "chest": 1}, {"room": 2, "chest": 3}]
+
+    client.post("/api/progress", json={}, headers=headers)
+    saved = client.put("/api/progress", json={"chest_states": chests}, headers=headers).json()
+    assert json.loads(saved["chest_states"]) == chests
+
+    opened = client.post("/api/progress/chests", json={"room": 1, "chest": 2}, headers=headers).json()
+    assert json.loads(opened["chest_states"]) == [chests[0], {"room": 1, "chest": 2}, chests[1]]
+
+    # A save without chest_states leaves the opened chests alone
+    client.put("/api/progress", json={"score": 10}, headers=headers)
+    progress = client.get("/api/progress", headers=headers).json()
+    assert json.loads(progress["chest_states"]) == [chests[0], {"room": 1, "chest": 2}, chests[1]]
+
+    assert client.post("/api/progress/chests", json={"room": 1, "chest": 9}, headers=headers).status_code == 400
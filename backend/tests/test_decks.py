@@ -0,0 +1,175 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION DECK TESTS
+# ========================================
+
+from array import array
+
+import pytest
+from sqlalchemy import event, select, update
+
+import decks as decks_module
+from database import AsyncSessionLocal, async_engine
+from decks import DeckStore
+from models import AnsweredQuestion, Question, QuestionDeck
+from question_pool import QuestionPool
+
+from .conftest import add_questions, add_user
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh question pool for the deck store to draw against"""
+    pool = QuestionPool()
+    monkeypatch.setattr(decks_module, "question_pool", pool)
+    return pool
+
+
+def _deck_order(db, user_id: int, difficulty: str) -> list:
+    packed = db.scalar(select(QuestionDeck.question_ids).where(
+        QuestionDeck.user_id == user_id, QuestionDeck.difficulty == difficulty
+    ))
+    question_ids = array("i")
+    question_ids.frombytes(packed)
+    return list(question_ids)
+
+
+async def _draw(store: DeckStore, user_id: int, difficulty: str, exclude_ids=()):
+    async with AsyncSessionLocal() as session:
+        return await store.draw(session, user_id, difficulty, exclude_ids)
+
+
+class StatementCounter:
+    """Counts statements sent on the async engine"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def test_build_skips_answered_questions(db, run, pool):
+    ids = add_questions(db, [("easy", "stats")] * 4 + [("hard", "ml")])
+    user_id = add_user(db)
+    db.add(AnsweredQuestion(user_id=user_id, question_id=ids[1], answered_correctly=True))
+    db.commit()
+
+    run(DeckStore(5, 100).build(user_id))
+
+    assert sorted(_deck_order(db, user_id, "easy")) == [ids[0], ids[2], ids[3]]
+    assert _deck_order(db, user_id, "hard") == [ids[4]]
+
+
+def test_draws_follow_the_deck_without_queries(db, run, pool):
+    ids = add_questions(db, [("easy", "stats")] * 5)
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+
+    async def scenario():
+        await store.build(user_id)
+        first = await _draw(store, user_id, "easy")
+        with StatementCounter() as statements:
+            rest = [await _draw(store, user_id, "easy") for _ in range(4)]
+        return [first, *rest], statements.count
+
+    drawn, statements = run(scenario())
+    assert drawn == _deck_order(db, user_id, "easy")
+    assert statements == 0
+    assert store.stats()["dirty_decks"] == 1
+
+
+def test_draw_skips_excluded_and_answered(db, run, pool):
+    add_questions(db, [("easy", "stats")] * 4)
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+    run(store.build(user_id))
+    order = _deck_order(db, user_id, "easy")
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            await pool.refresh(session)
+            await pool.answered_slots(session, user_id)  # Load the bitset
+        pool.mark_answered(user_id, order[1])
+        return [
+            await _draw(store, user_id, "easy", [order[0]]),
+            await _draw(store, user_id, "easy"),
+        ]
+
+    # order[0] is excluded (and passed over), order[1] answered
+    assert run(scenario()) == [order[2], order[3]]
+
+
+def test_positions_are_flushed_and_reloaded(db, run, pool):
+    add_questions(db, [("easy", "stats")] * 3)
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+
+    async def scenario():
+        await store.build(user_id)
+        drawn = await _draw(store, user_id, "easy")
+        await store.flush()
+        # A new process continues where the first one left off
+        return drawn, await _draw(DeckStore(5, 100), user_id, "easy")
+
+    first, second = run(scenario())
+    order = _deck_order(db, user_id, "easy")
+    assert (first, second) == (order[0], order[1])
+    assert db.scalar(select(QuestionDeck.position).where(QuestionDeck.difficulty == "easy")) == 1
+
+
+def test_stale_deck_misses_and_rebuilds(db, run, pool, monkeypatch):
+    monkeypatch.setattr("question_pool.POOL_CHECK_SECONDS", 0)
+    ids = add_questions(db, [("easy", "stats")] * 2)
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+    run(store.build(user_id))
+
+    db.execute(update(Question.__table__).where(Question.id == ids[0]).values(difficulty="expert"))
+    db.commit()
+
+    async def scenario():
+        drawn = await _draw(store, user_id, "easy")
+        await store.stop()  # Waits for the rebuild the miss scheduled
+        return drawn, await _draw(store, user_id, "easy")
+
+    stale, rebuilt = run(scenario())
+    assert stale is None
+    assert rebuilt == ids[1]
+    assert store.misses == 1 and store.builds == 2
+
+
+def test_used_up_deck_returns_none(db, run, pool):
+    add_questions(db, [("easy", "stats")])
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+
+    async def scenario():
+        await store.build(user_id)
+        drawn = [await _draw(store, user_id, "easy"), await _draw(store, user_id, "easy")]
+        await store.stop()
+        return drawn
+
+    first, second = run(scenario())
+    assert first is not None and second is None
+
+
+def test_fresh_build_runs_again_after_a_running_build(db, run, pool):
+    add_questions(db, [("easy", "stats")])
+    user_id = add_user(db)
+    store = DeckStore(5, 100)
+
+    async def scenario():
+        store.schedule_build(user_id)
+        store.schedule_build(user_id)              # Deduplicated
+        store.schedule_build(user_id, fresh=True)  # Queued behind the running build
+        await store.stop()
+
+    run(scenario())
+    assert store.builds == 2
@@ -0,0 +1,74 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION IMPORTER TESTS
+# ========================================
+
+import json
+
+import question_pool as question_pool_module
+from database import AsyncSessionLocal
+from import_questions import import_questions, read_rows
+from models import Question
+from question_pool import QuestionPool
+
+
+def _row(text: str, difficulty: str = "easy", **overrides) -> dict:
+    row = {
+        "question_text": text,
+        "option_a": "A",
+        "option_b": "B",
+        "option_c": "C",
+        "option_d": "D",
+        "correct_answer": "A",
+        "difficulty": difficulty,
+        "topic": "stats",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_malformed_json_lines_are_reported_as_invalid(db, tmp_path, capsys):
+    path = tmp_path / "questions.jsonl"
+    path.write_text("\n".join([
+        json.dumps(_row("First?")),
+        '{"question_text": "Broken?",',
+        json.dumps(_row("Third?", correct_answer="Z")),
+        json.dumps(_row("Fourth?")),
+    ]) + "\n")
+
+    report = import_questions(read_rows(str(path)), source="questions.jsonl")
+
+    assert (report["read"], report["invalid"], report["written"]) == (4, 2, 2)
+    output = capsys.readouterr().out
+    assert "questions.jsonl:2 skipped: invalid JSON" in output
+    assert "questions.jsonl:3 skipped" in output
+    assert db.query(Question).count() == 2
+
+
+def test_written_counts_only_inserted_or_changed_rows(db):
+    rows = [_row("First?"), _row("Second?"), _row("First?", explanation="Repeat wins")]
+    assert import_questions(rows)["written"] == 2
+
+    # Re-importing the same file changes nothing
+    assert import_questions([_row("First?", explanation="Repeat wins"), _row("Second?")])["written"] == 0
+
+    report = import_questions([_row("First?", "expert", explanation="Repeat wins"), _row("Third?")])
+    assert report["written"] == 2
+    assert db.query(Question).count() == 3
+
+
+def test_reimport_changes_pool_fingerprint(db, run, monkeypatch):
+    monkeypatch.setattr(question_pool_module, "POOL_CHECK_SECONDS", 0)
+    import_questions([_row("First?"), _row("Second?")])
+    pool = QuestionPool()
+
+    async def refresh():
+        async with AsyncSessionLocal() as session:
+            await pool.refresh(session)
+
+    run(refresh())
+    import_questions([_row("First?", "expert")])
+    run(refresh())
+
+    first_id = db.query(Question.id).filter(Question.question_text == "First?").scalar()
+    assert pool.version == 2
+    assert [pool.ids[slot] for slot in pool.by_difficulty["expert"]] == [first_id]
@@ -0,0 +1,125 @@
+# ========================================
+# DATA SCIENCE DUNGEON - QUESTION POOL TESTS
+# ========================================
+
+from sqlalchemy import update
+
+import question_pool as question_pool_module
+from database import AsyncSessionLocal
+from models import AnsweredQuestion, Question
+from question_pool import QuestionPool
+
+from .conftest import add_questions, add_user
+
+
+async def _refresh(pool: QuestionPool):
+    async with AsyncSessionLocal() as session:
+        await pool.refresh(session)
+
+
+def test_refresh_loads_ids_by_difficulty(db, run):
+    ids = add_questions(db, [("easy", "stats"), ("easy", "ml"), ("hard", "ml")])
+    pool = QuestionPool()
+    run(_refresh(pool))
+
+    assert list(pool.ids) == ids
+    assert [pool.ids[slot] for slot in pool.by_difficulty["easy"]] == ids[:2]
+    assert [pool.ids[slot] for slot in pool.by_topic["ml"]] == ids[1:]
+    assert pool.version == 1
+
+
+def test_refresh_detects_in_place_updates(db, run, monkeypatch):
+    monkeypatch.setattr(question_pool_module, "POOL_CHECK_SECONDS", 0)
+    ids = add_questions(db, [("easy", "stats"), ("easy", "ml")])
+    pool = QuestionPool()
+    run(_refresh(pool))
+
+    # A Core UPDATE (as a re-import does) fires no ORM events
+    db.execute(update(Question.__table__).where(Question.id == ids[0]).values(difficulty="expert"))
+    db.commit()
+    run(_refresh(pool))
+
+    assert pool.version == 2
+    assert [pool.ids[slot] for slot in pool.by_difficulty["expert"]] == [ids[0]]
+    assert [pool.ids[slot] for slot in pool.by_difficulty["easy"]] == [ids[1]]
+
+
+def test_refresh_is_throttled_until_invalidated(db, run):
+    add_questions(db, [("easy", "stats")])
+    pool = QuestionPool()
+    run(_refresh(pool))
+
+    add_questions(db, [("hard", "ml")])
+    run(_refresh(pool))
+    assert len(pool.ids) == 1  # Within POOL_CHECK_SECONDS: not re-checked
+
+    pool.invalidate()
+    run(_refresh(pool))
+    assert len(pool.ids) == 2
+    assert pool.version == 2
+
+
+def test_unchanged_table_keeps_version(db, run, monkeypatch):
+    monkeypatch.setattr(question_pool_module, "POOL_CHECK_SECONDS", 0)
+    add_questions(db, [("easy", "stats")])
+    pool = QuestionPool()
+    run(_refresh(pool))
+    run(_refresh(pool))
+    assert pool.version == 1
+
+
+def test_pick_skips_answered_and_excluded(db, run):
+    ids = add_questions(db, [("easy", "stats")] * 3)
+    user_id = add_user(db)
+    db.add(AnsweredQuestion(user_id=user_id, question_id=ids[0], answered_correctly=True))
+    db.commit()
+    pool = QuestionPool()
+
+    async def picks():
+        async with AsyncSessionLocal() as session:
+            return {await pool.pick(session, "easy", user_id, [ids[1]]) for _ in range(20)}
+
+    assert run(picks()) == {ids[2]}
+
+    pool.mark_answered(user_id, ids[2])
+
+    async def exhausted():
+        async with AsyncSessionLocal() as session:
+            return await pool.pick(session, "easy", user_id, [ids[1]])
+
+    assert run(exhausted()) is None
+
+
+def test_reload_during_bitset_load_is_not_cached_stale(db, run):
+    ids = add_questions(db, [("easy", "stats")] * 2)
+    user_id = add_user(db)
+    db.add(AnsweredQuestion(user_id=user_id, question_id=ids[1], answered_correctly=True))
+    db.commit()
+    pool = QuestionPool()
+    run(_refresh(pool))
+
+    # The bank grows (new ids sort first) while the answered ids are loading
+    new_rows = [(id_, "easy", "stats") for id_ in range(ids[0] - 16, ids[0])]
+    reloads = []
+
+    class ReloadingSession:
+        def __init__(self, session):
+            self.session = session
+
+        async def scalars(self, *args, **kwargs):
+            result = await self.session.scalars(*args, **kwargs)
+            if not reloads:
+                reloads.append(pool.version)
+                pool._load(new_rows + [(id_, "easy", "stats") for id_ in ids])
+            return result
+
+    async def answered():
+        async with AsyncSessionLocal() as session:
+            return await pool.is_answered(ReloadingSession(session), user_id, ids[1])
+
+    assert run(answered()) is True
+    assert reloads == [1] and pool.version == 2
+    bits = pool._answered[user_id][1]
+    assert len(bits) == (len(pool.ids) + 7) // 8
+    slot = pool.slots[ids[1]]
+    assert bits[slot >> 3] & (1 << (slot & 7))
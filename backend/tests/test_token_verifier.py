@@ -0,0 +1,118 @@
+# ========================================
+# DATA SCIENCE DUNGEON - TOKEN VERIFIER TESTS
+# ========================================
+
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+from jose import jwt
+
+import cache
+import token_verifier
+from token_verifier import TokenVerifier, b64url_encode
+
+SECRET = "test-secret"
+OTHER_SECRET = "other-secret"
+
+
+def jose_user_id(token: str):
+    """The reference path: jose decode plus the integer subject"""
+    try:
+        return int(jwt.decode(token, SECRET, algorithms=["HS256"])["sub"])
+    except Exception:
+        return None
+
+
+def sign(header: dict, claims: dict, secret: str = SECRET, digest=hashlib.sha256) -> str:
+    """Hand-rolled token, so headers and claims jose would not write can be tested"""
+    signing_input = ".".join(
+        b64url_encode(json.dumps(part, separators=(",", ":")).encode()) for part in (header, claims)
+    )
+    signature = hmac.new(secret.encode(), signing_input.encode(), digest).digest()
+    return f"{signing_input}.{b64url_encode(signature)}"
+
+
+def _later() -> int:
+    return int(time.time()) + 3600
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier(SECRET, 100, 3600)
+
+
+def test_accepts_tokens_jose_accepts(verifier):
+    tokens = [
+        jwt.encode({"sub": "7", "exp": _later()}, SECRET, algorithm="HS256"),
+        jwt.encode({"sub": "8"}, SECRET, algorithm="HS256"),  # No exp
+        sign({"typ": "JWT", "alg": "HS256"}, {"sub": "9", "exp": _later()}),  # Other header layout
+    ]
+    for token in tokens:
+        assert verifier.verify(token)[0] == jose_user_id(token)
+
+
+@pytest.mark.parametrize("make_token", [
+    pytest.param(lambda: jwt.encode({"sub": "7", "exp": _later()}, OTHER_SECRET, algorithm="HS256"), id="wrong-secret"),
+    pytest.param(lambda: jwt.encode({"sub": "7", "exp": int(time.time()) - 10}, SECRET, algorithm="HS256"), id="expired"),
+    pytest.param(lambda: jwt.encode({"sub": "7", "nbf": _later()}, SECRET, algorithm="HS256"), id="not-yet-valid"),
+    pytest.param(lambda: jwt.encode({"sub": "7", "exp": "soon"}, SECRET, algorithm="HS256"), id="exp-not-a-number"),
+    pytest.param(lambda: jwt.encode({"sub": 7, "exp": _later()}, SECRET, algorithm="HS256"), id="sub-not-a-string"),
+    pytest.param(lambda: jwt.encode({"exp": _later()}, SECRET, algorithm="HS256"), id="no-sub"),
+    pytest.param(lambda: jwt.encode({"sub": "7"}, SECRET, algorithm="HS512"), id="hs512"),
+    pytest.param(lambda: sign({"alg": "HS512", "typ": "JWT"}, {"sub": "7"}, digest=hashlib.sha512), id="hs512-hand-signed"),
+    pytest.param(lambda: sign({"alg": "none", "typ": "JWT"}, {"sub": "7"}).rsplit(".", 1)[0] + ".", id="alg-none"),
+    pytest.param(lambda: sign({"alg": "none", "typ": "JWT"}, {"sub": "7"}), id="alg-none-signed"),
+    pytest.param(lambda: sign({"alg": "HS256", "typ": "JWT"}, ["not", "an", "object"]), id="payload-not-object"),
+])
+def test_rejects_tokens_jose_rejects(verifier, make_token):
+    token = make_token()
+    assert jose_user_id(token) is None
+    assert verifier.verify(token) is None
+    assert verifier.user_id(token) is None
+
+
+def test_rejects_tampered_payload(verifier):
+    token = jwt.encode({"sub": "7", "exp": _later()}, SECRET, algorithm="HS256")
+    header, _, signature = token.split(".")
+    forged = b64url_encode(json.dumps({"sub": "1", "exp": _later()}).encode())
+    tampered = f"{header}.{forged}.{signature}"
+
+    assert jose_user_id(tampered) is None
+    assert verifier.verify(tampered) is None
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c.d", "!!.@@.##", "..", "e30.e30."])
+def test_rejects_malformed_tokens(verifier, token):
+    assert verifier.verify(token) is None
+
+
+class FakeClock:
+    """Stands in for the time module in token_verifier and cache"""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_user_id_caches_until_expiry(verifier, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(token_verifier, "time", clock)
+    monkeypatch.setattr(cache, "time", clock)
+
+    token = jwt.encode({"sub": "7", "exp": int(clock.now) + 60}, SECRET, algorithm="HS256")
+    assert verifier.user_id(token) == 7
+    assert verifier.user_id(token) == 7
+    assert (verifier.verified, verifier.cache.stats()["hits"]) == (1, 1)
+
+    # Past exp the cached entry is gone and a fresh verify rejects the token
+    clock.now += 120
+    assert verifier.user_id(token) is None
+    assert verifier.rejected == 1
@@ -0,0 +1,132 @@
+# ========================================
+# DATA SCIENCE DUNGEON - TOKEN VERIFIER
+# ========================================
+"""
+Hot-path verification of the JWTs issued by auth.create_access_token.
+
+Almost every request carries a bearer token. jose.jwt.decode runs its
+generic claim pipeline, and the old path then built a Pydantic TokenData on
+every call. This verifier handles only the token shape the app issues
+(HS256, a string "sub" holding the user id, an "exp" timestamp):
+
+- the HMAC key object is built once and copied per check, so the key is not
+  re-derived for every token
+- the header segment the app issues is matched as a plain string; any other
+  header is decoded and must name HS256 (never "none" or another algorithm)
+- the signature is compared in constant time before the payload is parsed
+- results are (user id, exp) tuples, memoized per token in a bounded LRU
+  until the token expires
+
+Tokens are still signed by jose, so both sides stay compatible.
+"""
+
+from typing import Optional, Tuple
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+
+from cache import TTLCache
+
+ALGORITHM = "HS256"
+
+# (user id, exp) of a verified token
+Claims = Tuple[int, Optional[float]]
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# The header jose writes for HS256 tokens (compact JSON, sorted keys)
+STANDARD_HEADER = b64url_encode(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode()
+)
+
+
+class TokenVerifier:
+    """Verifies HS256 access tokens and remembers the results until exp"""
+
+    def __init__(self, secret: str, max_entries: int, max_seconds: float):
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self.cache = TTLCache(max_entries, max_seconds)
+
+        # Metrics
+        self.verified = 0
+        self.rejected = 0
+
+    def user_id(self, token: str) -> Optional[int]:
+        """User id of a valid token, verifying only on cache misses"""
+        user_id = self.cache.get(token)
+        if user_id is not None:
+            return user_id
+
+        claims = self.verify(token)
+        if claims is None:
+            return None
+
+        user_id, exp = claims
+        self.cache.set(token, user_id, exp - time.time() if exp is not None else None)
+        return user_id
+
+    def verify(self, token: str) -> Optional[Claims]:
+        """Check the signature and the exp/nbf/sub claims (no caching)"""
+        try:
+            claims = self._verify(token)
+        except (ValueError, TypeError, UnicodeError, binascii.Error):
+            claims = None
+
+        if claims is None:
+            self.rejected += 1
+        else:
+            self.verified += 1
+        return claims
+
+    def _verify(self, token: str) -> Optional[Claims]:
+        signing_input, _, signature = token.rpartition(".")
+        header, _, payload = signing_input.partition(".")
+        if not header or not payload or "." in payload:
+            return None
+        if header != STANDARD_HEADER and not _is_hs256_header(header):
+            return None
+
+        mac = self._mac.copy()
+        mac.update(signing_input.encode("ascii"))
+        if not hmac.compare_digest(mac.digest(), b64url_decode(signature)):
+            return None
+
+        claims = json.loads(b64url_decode(payload))
+        if not isinstance(claims, dict):
+            return None
+
+        # Same rules as jose with no leeway: expired once exp is in the past
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None and (not _is_number(exp) or exp < int(now)):
+            return None
+        nbf = claims.get("nbf")
+        if nbf is not None and (not _is_number(nbf) or nbf > now):
+            return None
+
+        sub = claims.get("sub")
+        if not isinstance(sub, str):
+            return None
+        return int(sub), exp
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "verified": self.verified, "rejected": self.rejected}
+
+
+def _is_hs256_header(segment: str) -> bool:
+    header = json.loads(b64url_decode(segment))
+    return isinstance(header, dict) and header.get("alg") == ALGORITHM
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
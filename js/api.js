@@ -145,6 +145,16 @@ class ApiService {
         return this.handleResponse(response);
     }
 
+    async openChest(room, chest) {
+        const response = await this.fetchWithTimeout(`${API_BASE_URL}/progress/chests`, {
+            method: 'POST',
+            headers: this.getHeaders(),
+            body: JSON.stringify({ room, chest }),
+            timeout: 2000 // 2s timeout
+        });
+        return this.handleResponse(response);
+    }
+
     async deleteProgress() {
         const response = await fetch(`${API_BASE_URL}/progress`, {
             method: 'DELETE',
@@ -163,6 +173,14 @@ class ApiService {
         return this.handleResponse(response);
     }
 
+    // One question per chest, in chest order; reserved for the signed-in user
+    async getRoomQuestions(room) {
+        const response = await fetch(`${API_BASE_URL}/questions/room/${room}`, {
+            headers: this.getHeaders(),
+        });
+        return this.handleResponse(response);
+    }
+
     async getRandomQuestion(difficulty, excludeIds = []) {
         let url = `${API_BASE_URL}/questions/random?difficulty=${difficulty}`;
         if (excludeIds.length > 0) {
@@ -188,6 +206,18 @@ class ApiService {
         return this.handleResponse(response);
     }
 
+    // answers: [{ question_id, answered_correctly, room_number }], at most 100
+    // keepalive lets the request finish while the page unloads
+    async markQuestionsAnswered(answers, keepalive = false) {
+        const response = await fetch(`${API_BASE_URL}/questions/answered/batch`, {
+            method: 'POST',
+            headers: this.getHeaders(),
+            body: JSON.stringify({ answers }),
+            keepalive,
+        });
+        return this.handleResponse(response);
+    }
+
     async getAnsweredQuestions() {
         const response = await fetch(`${API_BASE_URL}/questions/answered`, {
             headers: this.getHeaders(),
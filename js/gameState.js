@@ -2,11 +2,20 @@
 // DATA SCIENCE DUNGEON - GAME STATE
 // ========================================
 
+// Answers whose POST failed are retried in batches
+const ANSWER_RETRY_MS = 5000;
+const ANSWER_BATCH_SIZE = 100; // Server limit per batch
+
 class GameState {
     constructor() {
         this.reset();
         this.user = null;
         this.isOnline = false;
+
+        // questionId -> { question_id, answered_correctly, room_number }
+        this.pendingAnswers = new Map();
+        setInterval(() => this.flushAnswers(), ANSWER_RETRY_MS);
+        window.addEventListener('pagehide', () => this.flushAnswers(true));
     }
 
     reset() {
@@ -16,6 +25,7 @@ class GameState {
         this.totalCorrect = 0;
         this.totalIncorrect = 0;
         this.chestsOpened = []; // Array of {room, chest} objects
+        this.unsyncedChests = 0; // Chest opens the server has not acknowledged
         this.gameCompleted = false;
         this.isGameOver = false;
         this.isPaused = false;
@@ -79,12 +89,18 @@ class GameState {
             score: this.score,
             total_correct: this.totalCorrect,
             total_incorrect: this.totalIncorrect,
-            chest_states: this.chestsOpened,
             game_completed: this.gameCompleted,
         };
 
+        // Resend the full chest list only while a chest POST is unacknowledged
+        const unsynced = this.unsyncedChests;
+        if (unsynced > 0) {
+            saveData.chest_states = this.chestsOpened.slice();
+        }
+
         try {
             await window.api.updateProgress(saveData);
+            this.unsyncedChests -= unsynced; // Failures since stay pending
             console.log('[GameState] Saved to server');
             return true;
         } catch (e) {
@@ -117,6 +133,7 @@ class GameState {
             } else {
                 this.chestsOpened = [];
             }
+            this.unsyncedChests = 0;
 
             console.log('[GameState] Loaded from server:', data);
             this.notify(); // Update UI
@@ -153,6 +170,7 @@ class GameState {
     }
 
     async clearSave() {
+        this.pendingAnswers.clear(); // The server forgets answers on reset
         if (this.isOnline && this.user) {
             try {
                 await window.api.deleteProgress();
@@ -191,6 +209,7 @@ class GameState {
     logout() {
         window.api.logout();
         this.user = null;
+        this.pendingAnswers.clear();
         this.reset();
     }
 
@@ -206,6 +225,16 @@ class GameState {
         if (!this.isChestOpened(roomNumber, chestNumber)) {
             this.chestsOpened.push({ room: roomNumber, chest: chestNumber });
             this.notify(); // Update UI
+
+            // Send only the opened chest; if that fails, the next save
+            // carries the full list instead
+            if (this.isOnline && this.user) {
+                window.api.openChest(roomNumber, chestNumber).catch(e => {
+                    console.error('[GameState] Failed to save chest, resending with next save:', e);
+                    this.unsyncedChests++;
+                    this.save().catch(err => console.error('Background save failed:', err));
+                });
+            }
         }
     }
 
@@ -229,13 +258,7 @@ class GameState {
         this.notify(); // Update UI IMMEDIATELY
 
         // Record on server if online
-        if (this.isOnline && this.user && questionId) {
-            try {
-                await window.api.markQuestionAnswered(questionId, true, roomNumber);
-            } catch (e) {
-                console.error('Failed to record answer on server:', e);
-            }
-        }
+        await this.recordAnswer(questionId, true, roomNumber);
 
         // Autosave progress (non-blocking)
         this.save().catch(e => console.error('Background save failed:', e));
@@ -251,9 +274,7 @@ class GameState {
         this.notify(); // Update UI IMMEDIATELY
 
         // Record on server if online
-        if (this.isOnline && this.user && questionId) {
-            window.api.markQuestionAnswered(questionId, false, roomNumber).catch(console.error);
-        }
+        this.recordAnswer(questionId, false, roomNumber);
 
         if (this.health <= 0) {
             this.isGameOver = true;
@@ -267,6 +288,41 @@ class GameState {
         this.save().catch(e => console.error('Background save failed:', e));
     }
 
+    // ==================== ANSWER RECORDING ====================
+
+    // Post an answer; if that fails, queue it for the next batch flush
+    async recordAnswer(questionId, answeredCorrectly, roomNumber = null) {
+        if (!this.isOnline || !this.user || !questionId) return;
+        try {
+            await window.api.markQuestionAnswered(questionId, answeredCorrectly, roomNumber);
+        } catch (e) {
+            console.error('Failed to record answer on server, queued for retry:', e);
+            this.pendingAnswers.set(questionId, {
+                question_id: questionId,
+                answered_correctly: answeredCorrectly,
+                room_number: roomNumber,
+            });
+        }
+    }
+
+    // Replay queued answers through the batch endpoint (later answers win);
+    // it only stores them - the totals are already counted and saved by save()
+    async flushAnswers(keepalive = false) {
+        if (this.pendingAnswers.size === 0 || !this.user) return;
+        const batch = [...this.pendingAnswers.values()].slice(0, ANSWER_BATCH_SIZE);
+        try {
+            await window.api.markQuestionsAnswered(batch, keepalive);
+            batch.forEach(answer => {
+                // Keep answers re-queued (changed) while the request was in flight
+                if (this.pendingAnswers.get(answer.question_id) === answer) {
+                    this.pendingAnswers.delete(answer.question_id);
+                }
+            });
+        } catch (e) {
+            console.error('[GameState] Failed to flush queued answers:', e);
+        }
+    }
+
     // Move to next room
     async nextRoom() {
         if (this.currentRoom < 10) {
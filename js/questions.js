@@ -194,6 +194,7 @@ class QuestionManager {
         this.answeredQuestionIds = new Set();
         this.questions = [...QUESTIONS];
         this.isOnline = false;
+        this.roomDeals = new Map(); // room -> questions dealt for chests 1-3
     }
 
     async initialize() {
@@ -214,6 +215,7 @@ class QuestionManager {
 
     reset() {
         this.answeredQuestionIds = new Set();
+        this.roomDeals = new Map();
     }
 
     /**
@@ -227,22 +229,19 @@ class QuestionManager {
         // Try to get from API first
         if (this.isOnline && window.api.isAuthenticated()) {
             try {
-                const question = await window.api.getQuestionByRoomChest(roomNumber, chestNumber);
-                // Transform API response to match local format
-                return {
-                    id: question.id,
-                    topic: question.topic,
-                    difficulty: question.difficulty,
-                    question: question.question_text,
-                    options: {
-                        A: question.option_a,
-                        B: question.option_b,
-                        C: question.option_c,
-                        D: question.option_d
-                    },
-                    answer: question.correct_answer,
-                    explanation: question.explanation
-                };
+                // One request deals the whole room; later chests reuse it
+                const dealt = await this.getRoomDeal(roomNumber);
+                const question = dealt[chestNumber - 1];
+                if (question && !this.answeredQuestionIds.has(question.id)) {
+                    return question;
+                }
+            } catch (e) {
+                console.warn('Failed to deal room from API, asking for the single chest:', e);
+            }
+
+            // No usable dealt question: ask for this chest alone
+            try {
+                return this.fromApi(await window.api.getQuestionByRoomChest(roomNumber, chestNumber));
             } catch (e) {
                 console.warn('Failed to get question from API, using local fallback:', e);
             }
@@ -252,6 +251,37 @@ class QuestionManager {
         return this.getLocalQuestion(roomNumber, chestNumber);
     }
 
+    /**
+     * Get (fetching once per room) the questions dealt for a room's chests
+     */
+    async getRoomDeal(roomNumber) {
+        if (!this.roomDeals.has(roomNumber)) {
+            const questions = await window.api.getRoomQuestions(roomNumber);
+            this.roomDeals.set(roomNumber, questions.map(q => this.fromApi(q)));
+        }
+        return this.roomDeals.get(roomNumber);
+    }
+
+    /**
+     * Transform an API question to match the local format
+     */
+    fromApi(question) {
+        return {
+            id: question.id,
+            topic: question.topic,
+            difficulty: question.difficulty,
+            question: question.question_text,
+            options: {
+                A: question.option_a,
+                B: question.option_b,
+                C: question.option_c,
+                D: question.option_d
+            },
+            answer: question.correct_answer,
+            explanation: question.explanation
+        };
+    }
+
     /**
      * Get a question from local storage (offline fallback)
      */